@@ -1,9 +1,12 @@
 """
 Target agents to acquire 3000 paying applicants in 10 days
 """
+import asyncio
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
-from ..models import User, Payment
+from asgiref.sync import sync_to_async
+from ..payments.rollups import get_revenue_rollup
 
 class AcquisitionTargetAgent:
     """AI agent to achieve 3000 paying users in 10 days"""
@@ -12,6 +15,8 @@ class AcquisitionTargetAgent:
         self.target_users = 3000
         self.days = 10
         self.daily_target = self.target_users / self.days
+        self.strategy_limit = asyncio.Semaphore(getattr(settings, 'ACQUISITION_MAX_CONCURRENT_STRATEGIES', 6))
+        self.platform_limit = asyncio.Semaphore(getattr(settings, 'ACQUISITION_MAX_CONCURRENT_PLATFORMS', 4))
     
     async def execute_acquisition_strategy(self):
         """Execute multi-channel acquisition strategy"""
@@ -24,12 +29,34 @@ class AcquisitionTargetAgent:
             self.content_marketing
         ]
         
+        # Re-optimize as each channel reports, so budget shifts start before the slowest one finishes
         results = []
-        for strategy in strategies:
-            result = await strategy()
+        optimization = None
+        async for result in self.stream_strategy_results(strategies):
             results.append(result)
+            optimization = await self.optimize_based_on_results(results)
         
-        return await self.optimize_based_on_results(results)
+        return optimization
+    
+    async def stream_strategy_results(self, strategies):
+        """Run strategies concurrently and yield each result as it completes"""
+        tasks = [asyncio.create_task(self.run_strategy(strategy)) for strategy in strategies]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # The consumer stopped early; don't leave campaigns running unobserved
+            for task in tasks:
+                task.cancel()
+    
+    async def run_strategy(self, strategy):
+        """Run one strategy under the fan-out limit, turning failures into results"""
+        async with self.strategy_limit:
+            try:
+                return await strategy()
+            except Exception as e:
+                print(f"Acquisition strategy {strategy.__name__} failed: {str(e)}")
+                return {"strategy": strategy.__name__, "error": str(e)}
     
     async def social_media_blitz(self):
         """Execute social media marketing blitz"""
@@ -42,14 +69,29 @@ class AcquisitionTargetAgent:
         
         # Auto-post across all platforms
         platforms = ['tiktok', 'instagram', 'facebook', 'linkedin']
-        for platform in platforms:
-            await sm_manager.schedule_content_blitz(
-                platform=platform,
-                content_plan=content_plan,
-                duration_days=self.days
-            )
+        outcomes = await asyncio.gather(
+            *(self.schedule_platform(sm_manager, platform, content_plan) for platform in platforms),
+            return_exceptions=True
+        )
+        failed = [
+            platform for platform, outcome in zip(platforms, outcomes)
+            if isinstance(outcome, Exception)
+        ]
         
-        return {"strategy": "social_media_blitz", "estimated_reach": 500000}
+        return {"strategy": "social_media_blitz", "estimated_reach": 500000, "failed_platforms": failed}
+    
+    async def schedule_platform(self, sm_manager, platform, content_plan):
+        """Schedule the content blitz on one platform"""
+        async with self.platform_limit:
+            try:
+                return await sm_manager.schedule_content_blitz(
+                    platform=platform,
+                    content_plan=content_plan,
+                    duration_days=self.days
+                )
+            except Exception as e:
+                print(f"Content blitz on {platform} failed: {str(e)}")
+                raise
     
     async def paid_advertising(self):
         """Run targeted paid advertising campaigns"""
@@ -74,10 +116,11 @@ class AcquisitionTargetAgent:
     async def monitor_progress(self):
         """Monitor daily progress towards target"""
         start_date = timezone.now() - timedelta(days=self.days)
-        paying_users = User.objects.filter(
-            payment_status='paid',
-            date_joined__gte=start_date
-        ).count()
+        
+        # Read the hourly/daily buckets instead of counting users on every poll
+        rollup = get_revenue_rollup()
+        await sync_to_async(rollup.ensure_coverage)(start_date)
+        paying_users = rollup.total('paid_registrations', start_date)
         
         progress = (paying_users / self.target_users) * 100
         days_remaining = self.days - (timezone.now() - start_date).days
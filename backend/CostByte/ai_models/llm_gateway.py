@@ -0,0 +1,170 @@
+"""
+Process-wide async LLM gateway with rate limiting, retries and batching
+"""
+import asyncio
+import hashlib
+import random
+import time
+from django.conf import settings
+from .response_cache import get_response_cache
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate_per_minute`"""
+    
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, amount=1):
+        """Wait until `amount` tokens are available, then take them"""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+class OpenAIBackend:
+    """OpenAI chat completions over a pooled keep-alive HTTP client"""
+    
+    def __init__(self, api_key, max_connections=20):
+        import httpx
+        import openai
+        
+        self.openai = openai
+        self.client = openai.AsyncOpenAI(
+            api_key=api_key,
+            max_retries=0,  # retries are handled by the gateway
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                ),
+                timeout=httpx.Timeout(60.0, connect=10.0)
+            )
+        )
+    
+    async def complete(self, model, messages, **params):
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            **params
+        )
+        return response.choices[0].message.content
+    
+    def is_retryable(self, error):
+        return isinstance(error, (
+            self.openai.RateLimitError,
+            self.openai.APIConnectionError,
+            self.openai.APITimeoutError,
+            self.openai.InternalServerError
+        ))
+
+class StubBackend:
+    """Offline backend returning deterministic text, for load tests"""
+    
+    def __init__(self, latency=0.05, failure_rate=0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+    
+    async def complete(self, model, messages, **params):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            raise ConnectionError("Stub backend simulated failure")
+        
+        digest = hashlib.sha256(repr((model, messages)).encode('utf-8')).hexdigest()[:12]
+        return f"[stub {model} {digest}] {messages[-1]['content'][:200]}"
+    
+    def is_retryable(self, error):
+        return isinstance(error, ConnectionError)
+
+class LLMGateway:
+    """Shared entry point for all LLM calls in the platform"""
+    
+    def __init__(self, backend, requests_per_minute=500, tokens_per_minute=80000,
+                 max_concurrent=20, max_retries=4, base_delay=0.5, max_delay=20.0, use_cache=True):
+        self.backend = backend
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.use_cache = use_cache
+    
+    async def complete(self, model, messages, **params):
+        """Return the completion text for one chat request"""
+        if not self.use_cache:
+            return await self._complete(model, messages, **params)
+        
+        async def create():
+            return await self._complete(model, messages, **params)
+        
+        return await get_response_cache().get_or_create(model, messages, create, **params)
+    
+    async def complete_batch(self, requests, return_exceptions=False):
+        """Submit many requests at once; each item is a dict of `complete` kwargs"""
+        return await asyncio.gather(
+            *(self.complete(**request) for request in requests),
+            return_exceptions=return_exceptions
+        )
+    
+    async def _complete(self, model, messages, **params):
+        """Call the backend under rate limits, retrying transient failures with jitter"""
+        estimated_tokens = self.estimate_tokens(messages, params.get('max_tokens', 0))
+        
+        for attempt in range(self.max_retries + 1):
+            await self.request_bucket.acquire()
+            await self.token_bucket.acquire(estimated_tokens)
+            
+            try:
+                async with self.semaphore:
+                    return await self.backend.complete(model, messages, **params)
+            except Exception as e:
+                if attempt >= self.max_retries or not self.backend.is_retryable(e):
+                    raise
+                
+                # Full jitter keeps retries from synchronising across workers
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                print(f"LLM request failed ({e}); retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+    
+    @staticmethod
+    def estimate_tokens(messages, max_tokens=0):
+        """Rough token estimate (about 4 characters per token) for TPM accounting"""
+        prompt_chars = sum(len(message.get('content') or '') for message in messages)
+        return prompt_chars // 4 + max_tokens
+
+_gateway = None
+
+def get_llm_gateway():
+    """Return the process-wide LLM gateway configured from settings"""
+    global _gateway
+    if _gateway is None:
+        if getattr(settings, 'LLM_BACKEND', 'openai') == 'stub':
+            backend = StubBackend(latency=getattr(settings, 'LLM_STUB_LATENCY', 0.05))
+        else:
+            backend = OpenAIBackend(
+                api_key=settings.OPENAI_API_KEY,
+                max_connections=getattr(settings, 'LLM_MAX_CONNECTIONS', 20)
+            )
+        
+        _gateway = LLMGateway(
+            backend,
+            requests_per_minute=getattr(settings, 'LLM_REQUESTS_PER_MINUTE', 500),
+            tokens_per_minute=getattr(settings, 'LLM_TOKENS_PER_MINUTE', 80000),
+            max_concurrent=getattr(settings, 'LLM_MAX_CONCURRENT_REQUESTS', 20),
+            max_retries=getattr(settings, 'LLM_MAX_RETRIES', 4)
+        )
+    return _gateway
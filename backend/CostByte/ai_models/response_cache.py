@@ -0,0 +1,195 @@
+"""
+Content-addressed cache for LLM responses
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+
+class LLMResponseCache:
+    """Two-tier (memory + SQLite) cache keyed by a hash of model, prompt and parameters"""
+    
+    def __init__(self, path=None, max_memory_entries=1000, max_disk_entries=100000, ttl=7 * 24 * 3600):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        
+        self._memory = OrderedDict()
+        self._in_flight = {}
+        self._db = None
+        
+        # SQLite calls block, so the disk tier lives on its own thread and stays off the event loop
+        self._disk = ThreadPoolExecutor(max_workers=1, thread_name_prefix='llm-response-cache')
+        self._writes_since_trim = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'merged': 0}
+    
+    @staticmethod
+    def make_key(model, messages, **params):
+        """Hash the full request so byte-identical prompts share one entry"""
+        payload = json.dumps(
+            {'model': model, 'messages': messages, 'params': params},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    async def get_or_create(self, model, messages, create, **params):
+        """Return a cached completion, or call `create()` once for concurrent identical requests"""
+        key = self.make_key(model, messages, **params)
+        
+        cached = self._memory_get(key)
+        if cached is not None:
+            return cached
+        
+        # Merge identical requests that are already in flight (including their disk lookup)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.stats['merged'] += 1
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            row = await asyncio.get_running_loop().run_in_executor(self._disk, self._disk_get, key)
+            if row is not None:
+                content = self._disk_hit(key, *row)
+            else:
+                self.stats['misses'] += 1
+                content = await create()
+                self._store(key, content)
+            future.set_result(content)
+            return content
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+    
+    def get(self, key):
+        """Look up a key in memory, then on disk"""
+        content = self._memory_get(key)
+        if content is None:
+            row = self._disk.submit(self._disk_get, key).result()
+            if row is not None:
+                content = self._disk_hit(key, *row)
+        return content
+    
+    def set(self, key, content):
+        """Store a completion in both tiers"""
+        self._store(key, content).result()
+    
+    def close(self):
+        self._disk.shutdown(wait=True)
+    
+    def _memory_get(self, key):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, content = entry
+        if expires_at <= time.time():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        self.stats['memory_hits'] += 1
+        return content
+    
+    def _disk_hit(self, key, expires_at, content):
+        self._remember(key, expires_at, content)
+        self.stats['disk_hits'] += 1
+        return content
+    
+    def _store(self, key, content):
+        """Update memory now and queue the disk write; returns the write's future"""
+        now = time.time()
+        expires_at = now + self.ttl
+        self._remember(key, expires_at, content)
+        return self._disk.submit(self._disk_set, key, content, expires_at, now)
+    
+    def _disk_get(self, key):
+        """Read a live row as (expires_at, content); runs on the disk thread"""
+        now = time.time()
+        db = self._connection()
+        row = db.execute("SELECT expires_at, content FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        
+        if row[0] <= now:
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        
+        db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return row
+    
+    def _disk_set(self, key, content, expires_at, now):
+        """Write a row and periodically trim the table; runs on the disk thread"""
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO responses (key, content, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, content, expires_at, now)
+            )
+            
+            self._writes_since_trim += 1
+            if self._writes_since_trim >= 100:
+                self._trim_disk()
+        except Exception as e:
+            # The response is already in memory; losing the disk copy only costs a later miss
+            print(f"LLM response cache write failed: {str(e)}")
+    
+    def _remember(self, key, expires_at, content):
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._memory[key] = (expires_at, content)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _trim_disk(self):
+        """Drop expired rows and the least recently used rows over the size limit"""
+        db = self._connection()
+        db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        db.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+        self._writes_since_trim = 0
+    
+    def _connection(self):
+        """Open the SQLite store on first use"""
+        if self._db is None:
+            path = self.path or getattr(settings, 'LLM_CACHE_PATH', 'llm_cache.sqlite3')
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, content TEXT, expires_at REAL, accessed_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        return self._db
+
+_response_cache = None
+
+def get_response_cache():
+    """Return the process-wide LLM response cache"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = LLMResponseCache(
+            max_memory_entries=getattr(settings, 'LLM_CACHE_MEMORY_ENTRIES', 1000),
+            max_disk_entries=getattr(settings, 'LLM_CACHE_DISK_ENTRIES', 100000),
+            ttl=getattr(settings, 'LLM_CACHE_TTL', 7 * 24 * 3600)
+        )
+    return _response_cache
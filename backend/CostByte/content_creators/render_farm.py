@@ -0,0 +1,183 @@
+"""
+Parallel video rendering with a content-addressed cache of intermediate assets
+"""
+import asyncio
+import hashlib
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+
+# Output frame size per content type
+FRAME_SIZES = {
+    'reel': (1080, 1920),
+    'short': (1080, 1920),
+    'story': (1080, 1920),
+}
+DEFAULT_FRAME_SIZE = (1920, 1080)
+
+def script_length(content_type):
+    """Variants for one platform with the same script length share one script"""
+    return 'short' if content_type in ['reel', 'short'] else 'long'
+
+def render_text_overlay(text, size, output_path):
+    """Render a transparent text overlay PNG (runs in a worker process)"""
+    from moviepy.editor import TextClip
+    
+    width, height = size
+    clip = TextClip(text, fontsize=max(32, width // 18), color='white', font='Arial-Bold',
+                    method='caption', size=(int(width * 0.9), None))
+    clip.save_frame(output_path, t=0, withmask=True)
+    return output_path
+
+def composite_video(video_path, voiceover_path, overlay_path, size, output_path, fps=30):
+    """Composite visuals, voiceover and overlay and encode to MP4 (runs in a worker process)"""
+    from moviepy.editor import AudioFileClip, CompositeVideoClip, ImageClip, VideoFileClip
+    
+    voiceover = AudioFileClip(voiceover_path)
+    video = VideoFileClip(video_path).resize(newsize=size)
+    if video.duration > voiceover.duration:
+        video = video.subclip(0, voiceover.duration)
+    
+    overlay = (ImageClip(overlay_path, transparent=True)
+               .set_duration(min(5, video.duration))
+               .set_position(('center', 'bottom')))
+    
+    final = CompositeVideoClip([video, overlay], size=size).set_audio(voiceover)
+    final.write_videofile(output_path, fps=fps, codec='libx264', audio_codec='aac',
+                          threads=1, logger=None)
+    for clip in (final, video, voiceover):
+        clip.close()
+    return output_path
+
+class AssetCache:
+    """Files stored under the hash of the inputs that produced them"""
+    
+    def __init__(self, root):
+        self.root = root
+        self.stats = {'hits': 0, 'misses': 0}
+        self._inflight = {}
+    
+    def key(self, kind, *parts):
+        payload = "\x00".join([kind] + [str(part) for part in parts])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def path(self, kind, key, extension):
+        return os.path.join(self.root, kind, key[:2], f"{key}{extension}")
+    
+    async def get_or_create(self, kind, parts, extension, create):
+        """Return the cached asset path, calling `create(target_path)` at most once per key"""
+        key = self.key(kind, *parts)
+        target = self.path(kind, key, extension)
+        if os.path.exists(target):
+            self.stats['hits'] += 1
+            return target
+        
+        if target in self._inflight:
+            self.stats['hits'] += 1
+            return await asyncio.shield(self._inflight[target])
+        
+        self.stats['misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[target] = future
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            partial = f"{target}.{os.getpid()}.part{extension}"
+            produced = await create(partial)
+            
+            # Producers may write elsewhere; the asset only becomes visible once complete
+            if produced != partial:
+                shutil.copyfile(produced, partial)
+            os.replace(partial, target)
+            future.set_result(target)
+            return target
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Don't warn about unretrieved exceptions when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(target, None)
+
+class RenderFarm:
+    """Render many videos at once, sharing scripts, voiceovers, visuals and overlays"""
+    
+    def __init__(self, workers=None, cache_root=None):
+        self.workers = workers or os.cpu_count() or 2
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.assets = AssetCache(cache_root or getattr(settings, 'VIDEO_ASSET_CACHE_DIR', 'video_assets'))
+    
+    async def render_variants(self, creator, theme, variants):
+        """Render (platform, content_type) variants of one theme; returns video paths in order"""
+        # Scripts are written per platform; identical scripts still share assets through the cache
+        scripts = {}
+        for platform, content_type in variants:
+            key = (platform, script_length(content_type))
+            if key not in scripts:
+                scripts[key] = asyncio.ensure_future(
+                    creator.generate_video_script(theme, platform, content_type)
+                )
+        
+        return await asyncio.gather(*(
+            self.render(creator, theme, content_type, scripts[(platform, script_length(content_type))])
+            for platform, content_type in variants
+        ))
+    
+    async def render(self, creator, theme, content_type, script):
+        """Render one video from a script (or a future resolving to one)"""
+        script = await script
+        size = FRAME_SIZES.get(content_type, DEFAULT_FRAME_SIZE)
+        
+        # Voiceover, visuals and the overlay don't depend on each other
+        voiceover_path, video_path, overlay_path = await asyncio.gather(
+            self.assets.get_or_create(
+                'voiceover', [script], '.mp3',
+                lambda target: creator.generate_voiceover(script)
+            ),
+            self.assets.get_or_create(
+                'visuals', [theme, script], '.mp4',
+                lambda target: creator.generate_visuals(script, theme)
+            ),
+            self.overlay(self.headline(script), size),
+        )
+        
+        # Variants with the same inputs and frame size (e.g. reel and short) share one encode
+        return await self.assets.get_or_create(
+            'composite', [video_path, voiceover_path, overlay_path, size], '.mp4',
+            lambda target: self.run_in_pool(
+                composite_video, video_path, voiceover_path, overlay_path, size, target
+            )
+        )
+    
+    async def overlay(self, text, size):
+        return await self.assets.get_or_create(
+            'overlay', [text, size], '.png',
+            lambda target: self.run_in_pool(render_text_overlay, text, size, target)
+        )
+    
+    async def run_in_pool(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+    
+    @staticmethod
+    def headline(script):
+        """The script's hook, used as the on-screen text"""
+        for line in script.splitlines():
+            line = line.strip().strip('"')
+            if line:
+                return line[:80]
+        return ''
+    
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+_render_farm = None
+
+def get_render_farm():
+    """Return the process-wide render farm"""
+    global _render_farm
+    if _render_farm is None:
+        _render_farm = RenderFarm(workers=getattr(settings, 'VIDEO_RENDER_WORKERS', None))
+    return _render_farm
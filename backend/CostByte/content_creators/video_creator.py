@@ -1,35 +1,21 @@
 """
 AI video content creator for marketing
 """
-import openai
-from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip
+from ..ai_models.llm_gateway import get_llm_gateway
+from .render_farm import get_render_farm
 
 class VideoContentCreator:
     """Create marketing videos, reels, shorts automatically"""
     
-    def __init__(self):
-        self.openai_client = openai.Client(api_key=settings.OPENAI_API_KEY)
-    
     async def create_marketing_video(self, platform, content_type, theme):
         """Create AI-generated marketing video"""
-        
-        # Generate script
-        script = await self.generate_video_script(theme, platform, content_type)
-        
-        # Generate voiceover
-        voiceover_path = await self.generate_voiceover(script)
-        
-        # Create visuals
-        video_path = await self.generate_visuals(script, theme)
-        
-        # Combine elements
-        final_video = await self.combine_video_elements(
-            video_path, 
-            voiceover_path, 
-            script
-        )
-        
-        return final_video
+        videos = await self.create_video_variants(theme, [(platform, content_type)])
+        return videos[0]
+    
+    async def create_video_variants(self, theme, variants):
+        """Create one video per (platform, content_type), rendering shared assets once"""
+        # Script, voiceover and visuals run concurrently; compositing runs in a process pool
+        return await get_render_farm().render_variants(self, theme, variants)
     
     async def generate_video_script(self, theme, platform, content_type):
         """Generate engaging video script using AI"""
@@ -41,10 +27,9 @@ class VideoContentCreator:
         Include: hook, value proposition, call-to-action
         """
         
-        response = await self.openai_client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
+        # Shared gateway: pooled connections, rate limits, retries and response cache
+        return await get_llm_gateway().complete(
+            "gpt-4",
+            [{"role": "user", "content": prompt}],
             max_tokens=500
         )
-        
-        return response.choices[0].message.content
@@ -2,24 +2,27 @@
 Automated job application system
 """
 import asyncio
-from selenium import webdriver
+from datetime import datetime
+from django.conf import settings
 from selenium.webdriver.common.by import By
 from ..models import JobListing, JobApplication, User
+from .browser_pool import BrowserPool, DomainRateLimiter
+from .match_cache import MatchCache
+from .match_index import get_job_match_index
 
 class JobApplicationBot:
     """Automatically apply to jobs users qualify for"""
     
     def __init__(self):
-        self.driver = None
-        self.setup_driver()
-    
-    def setup_driver(self):
-        """Setup Selenium WebDriver"""
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        self.driver = webdriver.Chrome(options=options)
+        # Drivers are created lazily by the pool and shared across users
+        self.browser_pool = BrowserPool(
+            size=getattr(settings, 'BROWSER_POOL_SIZE', 4),
+            max_uses=getattr(settings, 'BROWSER_MAX_USES', 50)
+        )
+        self.domain_limiter = DomainRateLimiter(
+            min_interval=getattr(settings, 'APPLICATION_DOMAIN_INTERVAL', 2.0),
+            per_domain_concurrency=getattr(settings, 'APPLICATION_DOMAIN_CONCURRENCY', 1)
+        )
     
     async def auto_apply_for_user(self, user_id):
         """Automatically apply to qualified jobs for user"""
@@ -32,63 +35,75 @@ class JobApplicationBot:
         # Get qualified job listings
         qualified_jobs = await self.find_qualified_jobs(user)
         
-        applications = []
-        for job in qualified_jobs:
-            application = await self.apply_to_job(job, user, user_resume)
-            applications.append(application)
-            
-            # Rate limiting
-            await asyncio.sleep(2)
+        # Applications run in parallel; the pool and domain limiter bound the fan-out
+        applications = await asyncio.gather(*(
+            self.apply_to_job(job, user, user_resume) for job in qualified_jobs
+        ))
         
-        return applications
+        return list(applications)
     
     async def find_qualified_jobs(self, user):
         """Find jobs user qualifies for based on resume and qualifications"""
-        # Use AI matching algorithm
-        from ..ai_models.model_trainer import ModelTrainer
-        model_trainer = ModelTrainer()
+        # Listing embeddings are scored with matrix operations, not per-job model calls
+        match_index = get_job_match_index()
+        match_index.refresh()
         
+        # Only listings posted since the user's last run are scored, unless the profile changed
         user_profile = await self.extract_user_profile(user)
-        recent_jobs = JobListing.objects.filter(
-            is_active=True,
-            posted_date__gte=datetime.now() - timedelta(days=30)
+        scores = MatchCache(match_index).qualified_scores(
+            user.id,
+            self.profile_text(user_profile),
+            match_index.threshold
         )
         
-        qualified_jobs = []
-        for job in recent_jobs:
-            match_score = await model_trainer.calculate_job_match(
-                user_profile, 
-                job.description
-            )
-            
-            if match_score >= settings.MIN_MATCH_THRESHOLD:
-                qualified_jobs.append(job)
-        
-        return qualified_jobs
+        best = sorted(scores, key=scores.get, reverse=True)[:getattr(settings, 'MAX_JOB_MATCHES', 200)]
+        jobs = JobListing.objects.in_bulk(best)
+        return [jobs[job_id] for job_id in best if job_id in jobs]
+    
+    @staticmethod
+    def profile_text(user_profile):
+        """Flatten an extracted user profile into text for the match index"""
+        if isinstance(user_profile, dict):
+            return " ".join(str(value) for value in user_profile.values() if value)
+        return str(user_profile)
     
     async def apply_to_job(self, job, user, resume):
         """Apply to a specific job"""
+        # Skip reposts of a job the user has already applied to on another board
+        copies = get_job_match_index().dedup.cluster_members(job.id)
+        if JobApplication.objects.filter(user=user, job_id__in=copies).exists():
+            return None
+        
+        if not await self.submit_application(job, user, resume):
+            return None
+        
+        # Record application
+        application = JobApplication.objects.create(
+            user=user,
+            job=job,
+            resume_used=resume,
+            status='submitted',
+            applied_at=datetime.now()
+        )
+        
+        return application
+    
+    async def submit_application(self, job, user, resume):
+        """Fill and submit the application form; returns True on success"""
         try:
-            self.driver.get(job.apply_url)
+            # Rate limits apply per target site, so different sites proceed in parallel
+            async with self.domain_limiter.slot(job.apply_url), self.browser_pool.driver() as driver:
+                await driver.get(job.apply_url)
+                
+                # Fill application form
+                await self.fill_application_form(driver, user, resume, job)
+                
+                # Submit application
+                submit_button = await driver.find_element(By.XPATH, "//button[contains(text(), 'Submit')]")
+                await driver.click(submit_button)
             
-            # Fill application form
-            await self.fill_application_form(user, resume, job)
-            
-            # Submit application
-            submit_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Submit')]")
-            submit_button.click()
-            
-            # Record application
-            application = JobApplication.objects.create(
-                user=user,
-                job=job,
-                resume_used=resume,
-                status='submitted',
-                applied_at=datetime.now()
-            )
-            
-            return application
+            return True
             
         except Exception as e:
             print(f"Failed to apply to job {job.id}: {str(e)}")
-            return None
+            return False
@@ -0,0 +1,111 @@
+"""
+Cross-user batch auto-apply scheduler
+"""
+import asyncio
+from datetime import datetime
+import numpy as np
+from django.conf import settings
+from django.db.models import Prefetch
+from ..models import JobListing, JobApplication, User
+from ..resumes.models import Resume
+from .application_bot import JobApplicationBot
+from .match_index import get_job_match_index
+
+class BatchAutoApplyScheduler:
+    """Match a whole cohort of paid users against active listings in one pass"""
+    
+    def __init__(self, bot=None, match_index=None, chunk_size=256, max_applications_per_user=None):
+        self.bot = bot or JobApplicationBot()
+        self.match_index = match_index or get_job_match_index()
+        self.chunk_size = chunk_size
+        self.max_applications_per_user = max_applications_per_user or getattr(
+            settings, 'MAX_JOB_MATCHES', 200
+        )
+    
+    async def run(self, user_ids=None):
+        """Auto-apply for every paid user (or the given users); returns applications created"""
+        # Listings are synced and encoded once for the whole cohort, including the deactivation sweep
+        self.match_index.refresh(sweep=True)
+        
+        users = User.objects.filter(payment_status='paid', is_active=True).prefetch_related(
+            Prefetch('resumes', queryset=Resume.objects.filter(is_available=True), to_attr='available_resumes')
+        ).order_by('id')
+        if user_ids is not None:
+            users = users.filter(id__in=user_ids)
+        
+        created = 0
+        chunk = []
+        for user in users.iterator(chunk_size=self.chunk_size):
+            if user.available_resumes:
+                chunk.append(user)
+            if len(chunk) >= self.chunk_size:
+                created += await self.process_chunk(chunk)
+                chunk = []
+        if chunk:
+            created += await self.process_chunk(chunk)
+        
+        return created
+    
+    async def process_chunk(self, users):
+        """Score a chunk of users against all listings and submit their application queues"""
+        queues = await self.build_application_queues(users)
+        job_ids = {job_id for queue in queues.values() for job_id, _ in queue}
+        jobs = JobListing.objects.in_bulk(list(job_ids))
+        users_by_id = {user.id: user for user in users}
+        
+        submissions = []
+        for user_id, queue in queues.items():
+            user = users_by_id[user_id]
+            resume = user.available_resumes[0]
+            for job_id, _ in queue:
+                if job_id in jobs:
+                    submissions.append((user, jobs[job_id], resume))
+        
+        # The bot's browser pool and per-domain limiter bound real concurrency
+        results = await asyncio.gather(*(
+            self.bot.submit_application(job, user, resume) for user, job, resume in submissions
+        ))
+        
+        applied_at = datetime.now()
+        applications = [
+            JobApplication(
+                user=user,
+                job=job,
+                resume_used=resume,
+                status='submitted',
+                applied_at=applied_at
+            )
+            for (user, job, resume), submitted in zip(submissions, results) if submitted
+        ]
+        JobApplication.objects.bulk_create(applications, batch_size=1000)
+        return len(applications)
+    
+    async def build_application_queues(self, users):
+        """Return {user_id: [(job_id, score), ...]} from one users x listings score matrix"""
+        profiles = [await self.bot.extract_user_profile(user) for user in users]
+        profile_vectors = self.match_index.encoder.encode(
+            [self.bot.profile_text(profile) for profile in profiles]
+        )
+        scores, listing_ids = self.match_index.score(profile_vectors)
+        
+        # Mask out jobs each user has already applied to (any copy of them), in one bulk read
+        dedup = self.match_index.dedup
+        column_of = {dedup.cluster_of(int(listing_id)): column for column, listing_id in enumerate(listing_ids)}
+        user_row = {user.id: row for row, user in enumerate(users)}
+        already_applied = JobApplication.objects.filter(
+            user_id__in=list(user_row)
+        ).values_list('user_id', 'job_id')
+        for user_id, job_id in already_applied.iterator(chunk_size=5000):
+            column = column_of.get(dedup.cluster_of(job_id))
+            if column is not None:
+                scores[user_row[user_id], column] = -np.inf
+        
+        return {
+            user.id: self.match_index.select_top_k(
+                scores[row],
+                listing_ids,
+                self.max_applications_per_user,
+                self.match_index.threshold
+            )
+            for row, user in enumerate(users)
+        }
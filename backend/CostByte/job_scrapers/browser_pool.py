@@ -0,0 +1,167 @@
+"""
+Pool of reusable headless WebDrivers and per-domain rate limiting
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from selenium import webdriver
+
+def create_chrome_driver():
+    """Build a headless Chrome WebDriver"""
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    return webdriver.Chrome(options=options)
+
+class PooledDriver:
+    """WebDriver wrapper that runs blocking Selenium calls in a worker thread"""
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.broken = False
+    
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking call (e.g. `driver.get`) off the event loop"""
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    async def get(self, url):
+        return await self.run(self.driver.get, url)
+    
+    async def find_element(self, by, value):
+        return await self.run(self.driver.find_element, by, value)
+    
+    async def click(self, element):
+        return await self.run(element.click)
+
+class BrowserPool:
+    """Fixed-size pool of WebDrivers with health checks and crash recycling"""
+    
+    def __init__(self, size=4, driver_factory=create_chrome_driver, max_uses=50, health_check_timeout=10):
+        self.size = size
+        self.driver_factory = driver_factory
+        self.max_uses = max_uses
+        self.health_check_timeout = health_check_timeout
+        self._idle = asyncio.Queue()
+        self._created = 0
+        
+        # Notified whenever a driver goes idle or a creation slot frees up
+        self._available = asyncio.Condition()
+        self.stats = {'created': 0, 'recycled': 0, 'health_failures': 0}
+    
+    @asynccontextmanager
+    async def driver(self):
+        """Borrow a healthy driver for the duration of the block"""
+        pooled = await self._acquire()
+        try:
+            yield pooled
+        except Exception:
+            # The page may be in any state; verify the driver before reuse
+            pooled.broken = not await self.is_healthy(pooled)
+            raise
+        finally:
+            await self._release(pooled)
+    
+    async def is_healthy(self, pooled):
+        """Check the driver still responds to commands"""
+        try:
+            await asyncio.wait_for(
+                pooled.run(lambda: pooled.driver.current_url),
+                timeout=self.health_check_timeout
+            )
+            return True
+        except Exception:
+            self.stats['health_failures'] += 1
+            return False
+    
+    async def health_check(self):
+        """Check every idle driver, replacing any that have died"""
+        for _ in range(self._idle.qsize()):
+            pooled = self._idle.get_nowait()
+            if not await self.is_healthy(pooled):
+                pooled.broken = True
+            await self._release(pooled, count_use=False)
+    
+    async def close(self):
+        """Quit all idle drivers"""
+        while not self._idle.empty():
+            pooled = self._idle.get_nowait()
+            await self._quit(pooled)
+            await self._free_slot()
+    
+    async def _acquire(self):
+        async with self._available:
+            while True:
+                if not self._idle.empty():
+                    return self._idle.get_nowait()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                await self._available.wait()
+        
+        try:
+            return await self._new_driver()
+        except Exception:
+            await self._free_slot()
+            raise
+    
+    async def _release(self, pooled, count_use=True):
+        if count_use:
+            pooled.uses += 1
+        
+        if pooled.broken or pooled.uses >= self.max_uses:
+            await self._quit(pooled)
+            self.stats['recycled'] += 1
+            try:
+                pooled = await self._new_driver()
+            except Exception as e:
+                print(f"Failed to replace WebDriver: {str(e)}")
+                await self._free_slot()
+                return
+        
+        async with self._available:
+            self._idle.put_nowait(pooled)
+            self._available.notify()
+    
+    async def _free_slot(self):
+        """Give up a creation slot and wake a waiter so it can build a driver itself"""
+        async with self._available:
+            self._created -= 1
+            self._available.notify()
+    
+    async def _new_driver(self):
+        driver = await asyncio.to_thread(self.driver_factory)
+        self.stats['created'] += 1
+        return PooledDriver(driver)
+    
+    async def _quit(self, pooled):
+        try:
+            await asyncio.wait_for(pooled.run(pooled.driver.quit), timeout=self.health_check_timeout)
+        except Exception:
+            pass
+
+class DomainRateLimiter:
+    """Per-domain concurrency and minimum spacing between requests"""
+    
+    def __init__(self, min_interval=2.0, per_domain_concurrency=1):
+        self.min_interval = min_interval
+        self.per_domain_concurrency = per_domain_concurrency
+        self._semaphores = {}
+        self._next_allowed = {}
+        self._locks = {}
+    
+    @asynccontextmanager
+    async def slot(self, url):
+        """Hold a request slot for the domain of `url`"""
+        domain = urlparse(url).netloc.lower()
+        semaphore = self._semaphores.setdefault(domain, asyncio.Semaphore(self.per_domain_concurrency))
+        
+        async with semaphore:
+            async with self._locks.setdefault(domain, asyncio.Lock()):
+                delay = self._next_allowed.get(domain, 0) - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._next_allowed[domain] = time.monotonic() + self.min_interval
+            yield
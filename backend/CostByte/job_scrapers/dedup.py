@@ -0,0 +1,136 @@
+"""
+Near-duplicate job listing detection with MinHash/LSH
+"""
+import re
+import zlib
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+MERSENNE_PRIME = (1 << 61) - 1
+
+class ListingDeduplicator:
+    """Incremental MinHash/LSH index that groups reposted listings into clusters"""
+    
+    def __init__(self, num_perm=128, bands=16, shingle_size=3, threshold=0.8, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        
+        # Universal hash family (a * x + b) mod p; products wrap at 2**64 as in datasketch
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        
+        # Only cluster representatives are kept in the LSH buckets
+        self._buckets = {}
+        self._signatures = {}
+        self._parent = {}
+        self._members = {}
+    
+    def signature(self, text):
+        """MinHash signature over hashed word shingles"""
+        tokens = TOKEN_PATTERN.findall((text or '').lower())
+        size = min(self.shingle_size, len(tokens)) or 1
+        shingles = {" ".join(tokens[i:i + size]) for i in range(max(len(tokens) - size + 1, 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+    
+    def add(self, listing_id, text):
+        """Index a listing; returns the representative it duplicates, or None"""
+        if listing_id in self._signatures:
+            self.forget(listing_id)
+        
+        signature = self.signature(text)
+        duplicate_of = self._best_candidate(signature)
+        
+        self._find(listing_id)
+        if duplicate_of is not None:
+            self._union(duplicate_of, listing_id)
+            # The newest copy represents the cluster, so it outlives older reposts
+            self.forget(duplicate_of)
+        
+        self._signatures[listing_id] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(listing_id)
+        
+        return duplicate_of
+    
+    def forget(self, listing_id):
+        """Remove a listing from the LSH buckets (cluster membership is kept)"""
+        signature = self._signatures.pop(listing_id, None)
+        if signature is None:
+            return
+        
+        for key in self._band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(listing_id)
+                if not bucket:
+                    del self._buckets[key]
+    
+    def cluster_of(self, listing_id):
+        """Canonical cluster id for a listing"""
+        return self._find(listing_id)
+    
+    def cluster_members(self, listing_id):
+        """All listing ids known to be copies of the same job"""
+        return list(self._members.get(self._find(listing_id), [listing_id]))
+    
+    def collapse(self, listing_ids):
+        """Keep the first listing of each cluster, preserving order"""
+        seen = set()
+        unique = []
+        for listing_id in listing_ids:
+            cluster = self._find(listing_id)
+            if cluster not in seen:
+                seen.add(cluster)
+                unique.append(listing_id)
+        return unique
+    
+    def _best_candidate(self, signature):
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+        
+        best, best_similarity = None, self.threshold
+        for candidate in candidates:
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        return best
+    
+    def _band_keys(self, signature):
+        rows = self.num_perm // self.bands
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+    
+    def _find(self, listing_id):
+        root = self._parent.setdefault(listing_id, listing_id)
+        while self._parent[root] != root:
+            root = self._parent[root]
+        
+        # Path compression
+        while listing_id != root:
+            self._parent[listing_id], listing_id = root, self._parent[listing_id]
+        return root
+    
+    def _union(self, a, b):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        
+        members_a = self._members.pop(root_a, [root_a])
+        members_b = self._members.pop(root_b, [root_b])
+        # The oldest listing id names the cluster
+        root, other = min(root_a, root_b), max(root_a, root_b)
+        self._parent[other] = root
+        self._members[root] = members_a + members_b
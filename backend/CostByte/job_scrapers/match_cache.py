@@ -0,0 +1,56 @@
+"""
+Persistent per-user match scores with listing watermarks
+"""
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+
+class MatchCache:
+    """Cache (profile version, listing) -> score so repeat runs only score new listings"""
+    
+    def __init__(self, match_index, timeout=None):
+        self.match_index = match_index
+        self.timeout = timeout or getattr(settings, 'MATCH_CACHE_TIMEOUT', 30 * 24 * 3600)
+    
+    def profile_version(self, profile_text, threshold):
+        """Version key that changes whenever the resume/profile or threshold changes"""
+        payload = f"{self.match_index.dim}|{threshold}|{profile_text}"
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def qualified_scores(self, user_id, profile_text, threshold):
+        """Return {listing_id: score} for active listings at or above the threshold"""
+        key = f"job_matches_{user_id}"
+        version = self.profile_version(profile_text, threshold)
+        entry = cache.get(key)
+        
+        if entry is None or entry['version'] != version:
+            # New user or changed profile: score the whole window once
+            scores = {}
+            since_id = None
+        else:
+            scores = entry['scores']
+            since_id = entry['watermark']
+        
+        vector = self.match_index.encoder.encode([profile_text])
+        new_scores, listing_ids = self.match_index.score(vector, since_id=since_id)
+        for listing_id, score in zip(listing_ids.tolist(), new_scores[0].tolist()):
+            if score >= threshold:
+                scores[listing_id] = score
+        
+        # Drop scores for listings that have expired or gone inactive
+        scores = {
+            listing_id: score for listing_id, score in scores.items()
+            if listing_id in self.match_index
+        }
+        
+        cache.set(key, {
+            'version': version,
+            'watermark': self.match_index.last_synced_id,
+            'scores': scores
+        }, timeout=self.timeout)
+        
+        return scores
+    
+    def invalidate(self, user_id):
+        """Force a full rescore on the user's next run"""
+        cache.delete(f"job_matches_{user_id}")
@@ -0,0 +1,222 @@
+"""
+Vectorized job-match index over active job listings
+"""
+import re
+import zlib
+from datetime import date, datetime, time, timedelta
+from time import monotonic
+import numpy as np
+from django.conf import settings
+from ..models import JobListing
+from .dedup import ListingDeduplicator
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+class HashingEncoder:
+    """Encode text as L2-normalised hashed word/bigram counts"""
+    
+    def __init__(self, dim=1024):
+        self.dim = dim
+    
+    def encode(self, texts):
+        """Return a (len(texts), dim) float32 matrix"""
+        rows, hashes = [], []
+        for row, text in enumerate(texts):
+            tokens = TOKEN_PATTERN.findall((text or '').lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            hashes.extend(zlib.crc32(feature.encode('utf-8')) for feature in features)
+            rows.extend([row] * len(features))
+        
+        hashes = np.asarray(hashes, dtype=np.uint32)
+        # Signed hashing keeps collisions from only ever adding up
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+        cells = np.asarray(rows, dtype=np.int64) * self.dim + hashes % self.dim
+        counts = np.bincount(cells, weights=signs, minlength=len(texts) * self.dim)
+        matrix = counts.reshape(len(texts), self.dim).astype(np.float32)
+        
+        # Sublinear term frequency, then unit length so dot products are cosines
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+class JobMatchIndex:
+    """Listing embeddings kept in one NumPy matrix for single-pass scoring"""
+    
+    def __init__(self, encoder=None, window_days=30, initial_capacity=1024, deduplicator=None, threshold=0.1,
+                 sweep_interval=300):
+        self.encoder = encoder or HashingEncoder()
+        self.dedup = deduplicator or ListingDeduplicator()
+        self.window_days = window_days
+        
+        # Index cosines are on their own scale (related pairs ~0.3, unrelated ~0.03),
+        # so this is calibrated separately from the model's MIN_MATCH_THRESHOLD
+        self.threshold = threshold
+        self.dim = self.encoder.dim
+        
+        self._vectors = np.zeros((initial_capacity, self.dim), dtype=np.float32)
+        self._ids = np.zeros(initial_capacity, dtype=np.int64)
+        self._posted = np.zeros(initial_capacity, dtype=np.float64)
+        self._active = np.zeros(initial_capacity, dtype=bool)
+        self._row_of = {}
+        self._free_rows = []
+        self._size = 0
+        self.last_synced_id = 0
+        
+        # Deactivations need a database scan, so they are swept on an interval, not per refresh
+        self.sweep_interval = sweep_interval
+        self._last_sweep = None
+    
+    def __len__(self):
+        return len(self._row_of)
+    
+    def __contains__(self, listing_id):
+        return listing_id in self._row_of
+    
+    def add(self, listing_ids, texts, posted_dates):
+        """Add or replace listings in the index"""
+        if not listing_ids:
+            return
+        
+        vectors = self.encoder.encode(texts)
+        for listing_id, text, vector, posted in zip(listing_ids, texts, vectors, posted_dates):
+            # Reposts replace the older copy, so each job occupies a single row
+            duplicate_of = self.dedup.add(listing_id, text)
+            if duplicate_of is not None:
+                self.remove([duplicate_of])
+            
+            row = self._row_of.get(listing_id)
+            if row is None:
+                row = self._allocate_row()
+                self._row_of[listing_id] = row
+            
+            self._vectors[row] = vector
+            self._ids[row] = listing_id
+            self._posted[row] = self._timestamp(posted)
+            self._active[row] = True
+    
+    def remove(self, listing_ids):
+        """Drop listings, freeing their rows for reuse"""
+        for listing_id in listing_ids:
+            row = self._row_of.pop(listing_id, None)
+            self.dedup.forget(listing_id)
+            if row is not None:
+                self._active[row] = False
+                self._free_rows.append(row)
+    
+    def expire(self, now=None):
+        """Drop listings posted before the matching window"""
+        cutoff = ((now or datetime.now()) - timedelta(days=self.window_days)).timestamp()
+        stale = np.flatnonzero(self._active[:self._size] & (self._posted[:self._size] < cutoff))
+        self.remove(self._ids[stale].tolist())
+        return len(stale)
+    
+    def score(self, profile_vectors, since_id=None):
+        """Score profiles against active listings (newer than `since_id` if given)"""
+        profile_vectors = np.atleast_2d(profile_vectors).astype(np.float32, copy=False)
+        active = self._active[:self._size]
+        
+        if since_id is not None:
+            rows = np.flatnonzero(active & (self._ids[:self._size] > since_id))
+            return profile_vectors @ self._vectors[rows].T, self._ids[rows]
+        
+        # Multiply against the whole backing matrix (a view) and drop free rows afterwards
+        scores = profile_vectors @ self._vectors[:self._size].T
+        return scores[:, active], self._ids[:self._size][active]
+    
+    def top_k(self, profile_text, k=50, threshold=0.0):
+        """Return up to k (listing_id, score) pairs at or above the threshold, best first"""
+        scores, ids = self.score(self.encoder.encode([profile_text]))
+        return self.select_top_k(scores[0], ids, k, threshold)
+    
+    @staticmethod
+    def select_top_k(scores, ids, k, threshold):
+        """Pick the best k entries of one score row without a full sort"""
+        candidates = np.flatnonzero(scores >= threshold)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(scores[candidates], -k)[-k:]]
+        candidates = candidates[np.argsort(scores[candidates])[::-1]]
+        return [(int(ids[i]), float(scores[i])) for i in candidates]
+    
+    def refresh(self, sweep=False):
+        """Sync with the database: add new listings and drop expired ones (deactivated ones on an interval)"""
+        start_date = datetime.now() - timedelta(days=self.window_days)
+        
+        new_listings = JobListing.objects.filter(
+            is_active=True,
+            posted_date__gte=start_date,
+            id__gt=self.last_synced_id
+        ).values_list('id', 'description', 'posted_date')
+        
+        added = 0
+        batch = []
+        for row in new_listings.iterator(chunk_size=2000):
+            batch.append(row)
+            if len(batch) >= 2000:
+                added += self._add_rows(batch)
+                batch = []
+        added += self._add_rows(batch)
+        
+        if sweep or self._last_sweep is None or monotonic() - self._last_sweep >= self.sweep_interval:
+            self.sweep_deactivated(start_date)
+        
+        self.expire()
+        return added
+    
+    def sweep_deactivated(self, start_date=None):
+        """Drop indexed listings that have been deactivated"""
+        start_date = start_date or datetime.now() - timedelta(days=self.window_days)
+        # Only inactive ids come back, which is far fewer rows than the active window
+        inactive_ids = JobListing.objects.filter(
+            is_active=False,
+            posted_date__gte=start_date,
+            id__lte=self.last_synced_id
+        ).values_list('id', flat=True)
+        self.remove([listing_id for listing_id in inactive_ids.iterator(chunk_size=5000) if listing_id in self._row_of])
+        self._last_sweep = monotonic()
+    
+    @staticmethod
+    def _timestamp(value):
+        if not isinstance(value, datetime) and isinstance(value, date):
+            value = datetime.combine(value, time())
+        return value.timestamp()
+    
+    def _add_rows(self, rows):
+        if not rows:
+            return 0
+        listing_ids, texts, posted_dates = zip(*rows)
+        self.add(list(listing_ids), list(texts), list(posted_dates))
+        self.last_synced_id = max(self.last_synced_id, max(listing_ids))
+        return len(rows)
+    
+    def _allocate_row(self):
+        if self._free_rows:
+            return self._free_rows.pop()
+        
+        if self._size == len(self._ids):
+            self._grow()
+        self._size += 1
+        return self._size - 1
+    
+    def _grow(self):
+        capacity = len(self._ids) * 2
+        self._vectors = np.resize(self._vectors, (capacity, self.dim))
+        self._ids = np.resize(self._ids, capacity)
+        self._posted = np.resize(self._posted, capacity)
+        active = np.zeros(capacity, dtype=bool)
+        active[:len(self._active)] = self._active
+        self._active = active
+
+_index = None
+
+def get_job_match_index():
+    """Return the process-wide job match index"""
+    global _index
+    if _index is None:
+        _index = JobMatchIndex(
+            encoder=HashingEncoder(dim=getattr(settings, 'JOB_MATCH_EMBEDDING_DIM', 1024)),
+            window_days=getattr(settings, 'JOB_MATCH_WINDOW_DAYS', 30),
+            threshold=getattr(settings, 'JOB_MATCH_INDEX_THRESHOLD', 0.1),
+            sweep_interval=getattr(settings, 'JOB_MATCH_SWEEP_INTERVAL', 300)
+        )
+    return _index
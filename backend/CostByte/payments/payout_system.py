@@ -2,16 +2,25 @@
 Weekly payout system with percentage distribution
 """
 import asyncio
+import csv
+import inspect
+import os
+import uuid
 from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_DOWN
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db import transaction
 from .models import Revenue, Payout
-from .payment_processors.eft_processor import EFTProcessor
+from .processor_registry import get_processor_registry
+from .rollups import get_revenue_rollup
 
 class WeeklyPayoutSystem:
     """Handle weekly revenue distribution"""
     
     def __init__(self):
-        self.eft_processor = EFTProcessor()
+        # Shares the registry's processor and pooled HTTP client with registration payments
+        self.eft_processor = get_processor_registry().processor('eft')
         self.payout_config = {
             'encore_aspire': {'account': settings.ENCORE_ASPIRE_ACCOUNT, 'percentage': 0.40},
             'my_world_african': {'account': settings.MY_WORLD_AFRICAN_ACCOUNT, 'percentage': 0.15},
@@ -19,48 +28,142 @@ class WeeklyPayoutSystem:
             'apex_digital': {'account': settings.APEX_DIGITAL_ACCOUNT, 'percentage': 0.20},
         }
     
-    async def process_weekly_payouts(self):
+    async def process_weekly_payouts(self, dispatch='transfer'):
         """Process weekly payouts every Monday"""
-        # Calculate weekly revenue
+        # Claim the week's revenue and record pending payouts in one transaction
+        payouts = await sync_to_async(self.claim_weekly_revenue)()
+        if not payouts:
+            return
+        
+        if dispatch == 'batch_file':
+            # One bank batch file for all recipients instead of individual transfers
+            await asyncio.to_thread(self.write_bank_batch_file, payouts)
+            for payout in payouts:
+                payout.status = 'batched'
+            await sync_to_async(Payout.objects.bulk_update)(payouts, ['status'])
+            self.record_payouts(payouts)
+            return payouts
+        
+        return await self.dispatch_payouts(payouts)
+    
+    def claim_weekly_revenue(self):
+        """Lock unprocessed revenue, total it and create pending Payout rows in one pass"""
         start_date = datetime.now() - timedelta(days=7)
-        weekly_revenue = Revenue.objects.filter(
-            created_at__gte=start_date,
-            payout_processed=False
-        ).aggregate(total=Sum('amount'))['total'] or 0
         
-        if weekly_revenue <= 0:
-            return
+        # The week is only a label; the claim id keeps references unique across claims in one week
+        batch = f"WEEKLY_PAYOUT_{datetime.now().strftime('%Y%W')}_{uuid.uuid4().hex[:12].upper()}"
         
-        # Process payouts to each account
-        payouts = []
-        for account_name, config in self.payout_config.items():
-            amount = weekly_revenue * config['percentage']
+        with transaction.atomic():
+            revenue = list(Revenue.objects.select_for_update(skip_locked=True).filter(
+                created_at__gte=start_date,
+                payout_processed=False
+            ).values_list('id', 'amount'))
             
-            payout = await self.eft_processor.transfer(
-                amount=amount,
-                from_account=settings.FNB_BUSINESS_ZERO_ACCOUNT,
-                to_account=config['account'],
-                reference=f"WEEKLY_PAYOUT_{datetime.now().strftime('%Y%W')}_{account_name.upper()}"
-            )
+            weekly_revenue = sum((amount for _, amount in revenue), Decimal('0'))
+            if weekly_revenue <= 0:
+                return []
             
-            # Record payout
-            payout_record = Payout.objects.create(
-                account_name=account_name,
-                amount=amount,
-                percentage=config['percentage'],
-                status=payout.status,
-                transaction_id=payout.transaction_id
-            )
-            payouts.append(payout_record)
+            # Mark exactly the rows that were summed, so late arrivals wait for next week
+            Revenue.objects.filter(id__in=[revenue_id for revenue_id, _ in revenue]).update(payout_processed=True)
+            
+            payouts = [
+                Payout(
+                    account_name=account_name,
+                    amount=self.payout_amount(weekly_revenue, config['percentage']),
+                    percentage=config['percentage'],
+                    status='pending',
+                    reference=f"{batch}_{account_name.upper()}"
+                )
+                for account_name, config in self.payout_config.items()
+            ]
+            return Payout.objects.bulk_create(payouts)
+    
+    async def dispatch_payouts(self, payouts):
+        """Send transfers concurrently; references double as idempotency keys so retries are safe"""
+        results = await asyncio.gather(
+            *(self.transfer_payout(payout) for payout in payouts),
+            return_exceptions=True
+        )
         
-        # Mark revenue as processed
-        Revenue.objects.filter(
-            created_at__gte=start_date,
-            payout_processed=False
-        ).update(payout_processed=True)
+        for payout, result in zip(payouts, results):
+            if isinstance(result, Exception):
+                print(f"Payout {payout.reference} failed: {str(result)}")
+                payout.status = 'failed'
+            else:
+                payout.status = result.status
+                payout.transaction_id = result.transaction_id
         
+        await sync_to_async(Payout.objects.bulk_update)(payouts, ['status', 'transaction_id'])
+        self.record_payouts([payout for payout in payouts if payout.status != 'failed'])
         return payouts
     
+    def record_payouts(self, payouts):
+        """Add sent payouts to the rollup buckets"""
+        rollup = get_revenue_rollup()
+        for payout in payouts:
+            rollup.record('payouts', payout.amount)
+    
+    async def transfer_payout(self, payout):
+        """Transfer a single payout to its configured account"""
+        details = {
+            'amount': payout.amount,
+            'from_account': settings.FNB_BUSINESS_ZERO_ACCOUNT,
+            'to_account': self.payout_config[payout.account_name]['account'],
+            'reference': payout.reference,
+        }
+        if self.supports_idempotency_key():
+            details['idempotency_key'] = payout.reference
+        return await self.eft_processor.transfer(**details)
+    
+    def supports_idempotency_key(self):
+        """Whether the processor's `transfer` accepts an idempotency key; otherwise the reference alone is sent"""
+        try:
+            parameters = inspect.signature(self.eft_processor.transfer).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        return any(
+            parameter.name == 'idempotency_key' or parameter.kind == parameter.VAR_KEYWORD
+            for parameter in parameters
+        )
+    
+    async def retry_failed_payouts(self):
+        """Re-dispatch payouts that failed or never completed"""
+        payouts = await sync_to_async(list)(Payout.objects.filter(status__in=['pending', 'failed']))
+        if not payouts:
+            return []
+        return await self.dispatch_payouts(payouts)
+    
+    def write_bank_batch_file(self, payouts, path=None):
+        """Write a single bulk EFT batch file (CSV) covering every recipient"""
+        if path is None:
+            directory = getattr(settings, 'PAYOUT_BATCH_DIR', 'payout_batches')
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{self.batch_reference(payouts[0])}.csv")
+        
+        with open(path, 'w', newline='') as batch_file:
+            writer = csv.writer(batch_file)
+            writer.writerow(['from_account', 'to_account', 'account_name', 'amount', 'reference'])
+            for payout in payouts:
+                writer.writerow([
+                    settings.FNB_BUSINESS_ZERO_ACCOUNT,
+                    self.payout_config[payout.account_name]['account'],
+                    payout.account_name,
+                    f"{payout.amount:.2f}",
+                    payout.reference
+                ])
+        
+        return path
+    
+    @staticmethod
+    def batch_reference(payout):
+        """Reference shared by every payout of one claim"""
+        return payout.reference[:-len(f"_{payout.account_name}")]
+    
+    @staticmethod
+    def payout_amount(total, percentage):
+        """Percentage share rounded down to the cent"""
+        return (Decimal(total) * Decimal(str(percentage))).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+    
     async def schedule_weekly_payouts(self):
         """Schedule automatic weekly payouts"""
         while True:
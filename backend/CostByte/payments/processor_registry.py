@@ -0,0 +1,140 @@
+"""
+Shared payment processors with pooled HTTP sessions, dispatched by payment method
+"""
+import asyncio
+import inspect
+import random
+import uuid
+from django.conf import settings
+
+class LocalPaymentResult:
+    """Result shape returned by the local gateway"""
+    
+    def __init__(self, success, status, transaction_id):
+        self.success = success
+        self.status = status
+        self.transaction_id = transaction_id
+
+class LocalGatewayProcessor:
+    """In-process stand-in for the EFT, PayFast and PayShap gateways, for load tests"""
+    
+    def __init__(self, latency=0.05, failure_rate=0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+    
+    async def process_payment(self, amount, **details):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        transaction_id = f"LOCAL_{uuid.uuid4().hex[:16].upper()}"
+        if random.random() < self.failure_rate:
+            return LocalPaymentResult(False, 'failed', transaction_id)
+        return LocalPaymentResult(True, 'completed', transaction_id)
+    
+    async def transfer(self, amount, **details):
+        """Outgoing transfers (payouts) behave like payments"""
+        return await self.process_payment(amount, **details)
+
+def eft_request(user, amount):
+    return {
+        'amount': amount,
+        'account': settings.FNB_BUSINESS_ZERO_ACCOUNT,
+        'reference': f"REG_{user.id}"
+    }
+
+def payfast_request(user, amount):
+    return {
+        'amount': amount,
+        'buyer': user,
+        'return_url': settings.PAYMENT_RETURN_URL
+    }
+
+def payshap_request(user, amount):
+    return {
+        'amount': amount,
+        'recipient': settings.FNB_BUSINESS_ZERO_ACCOUNT,
+        'reference': f"REG_{user.id}"
+    }
+
+class ProcessorRegistry:
+    """Lookup table of payment method -> (processor, request builder)"""
+    
+    def __init__(self):
+        self.handlers = {}
+    
+    def register(self, method, processor, build_request):
+        self.handlers[method] = (processor, build_request)
+    
+    def __contains__(self, method):
+        return method in self.handlers
+    
+    def processor(self, method):
+        """The shared processor registered for `method`"""
+        return self.handlers[method][0]
+    
+    async def process_payment(self, method, user, amount):
+        """Charge `amount` for `user` through the processor registered for `method`"""
+        try:
+            processor, build_request = self.handlers[method]
+        except KeyError:
+            raise ValueError("Unsupported payment method")
+        return await processor.process_payment(**build_request(user, amount))
+
+_http_client = None
+_processor_registry = None
+
+def get_http_client():
+    """Return the process-wide keep-alive HTTP client shared by the payment processors"""
+    global _http_client
+    if _http_client is None:
+        import httpx
+        
+        max_connections = getattr(settings, 'PAYMENT_MAX_CONNECTIONS', 50)
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0)
+        )
+    return _http_client
+
+def pooled_processor(processor_class, client):
+    """Build a processor on the shared client if its constructor takes `http_client`, else as before"""
+    try:
+        parameters = inspect.signature(processor_class).parameters
+    except (TypeError, ValueError):
+        parameters = {}
+    
+    if 'http_client' in parameters:
+        return processor_class(http_client=client)
+    print(f"{processor_class.__name__} does not accept http_client; it keeps its own HTTP session")
+    return processor_class()
+
+def get_processor_registry():
+    """Return the process-wide processor registry configured from settings"""
+    global _processor_registry
+    if _processor_registry is None:
+        registry = ProcessorRegistry()
+        
+        if getattr(settings, 'PAYMENT_GATEWAY_BACKEND', 'live') == 'local':
+            local = LocalGatewayProcessor(
+                latency=getattr(settings, 'PAYMENT_LOCAL_LATENCY', 0.05),
+                failure_rate=getattr(settings, 'PAYMENT_LOCAL_FAILURE_RATE', 0.0)
+            )
+            processors = {'eft': local, 'payfast': local, 'payshap': local}
+        else:
+            from .payment_processors import EFTProcessor, PayFastProcessor, PayShapProcessor
+            
+            client = get_http_client()
+            processors = {
+                'eft': pooled_processor(EFTProcessor, client),
+                'payfast': pooled_processor(PayFastProcessor, client),
+                'payshap': pooled_processor(PayShapProcessor, client),
+            }
+        
+        registry.register('eft', processors['eft'], eft_request)
+        registry.register('payfast', processors['payfast'], payfast_request)
+        registry.register('payshap', processors['payshap'], payshap_request)
+        _processor_registry = registry
+    return _processor_registry
@@ -0,0 +1,133 @@
+"""
+Incrementally maintained hourly and daily rollups of paid registrations and payouts
+"""
+import math
+from datetime import datetime
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Metric -> scale used to store it as an integer counter (money is kept in cents)
+METRICS = {
+    'paid_registrations': 1,
+    'payouts': 100,
+}
+
+class RevenueRollup:
+    """Time-bucketed counters in the shared cache; range totals cost O(buckets), not O(rows)"""
+    
+    def __init__(self, prefix='rollup', hourly_retention=None, daily_retention=None):
+        self.prefix = prefix
+        self.hourly_retention = hourly_retention or getattr(settings, 'ROLLUP_HOURLY_RETENTION', 35 * DAY)
+        self.daily_retention = daily_retention or getattr(settings, 'ROLLUP_DAILY_RETENTION', 400 * DAY)
+    
+    def record(self, metric, amount=1, when=None):
+        """Add an event to the hourly and daily buckets it falls in"""
+        delta = self._to_units(metric, amount)
+        if not delta:
+            return
+        
+        hour = int((when or timezone.now()).timestamp() // HOUR)
+        try:
+            for key, timeout in (
+                (self._key(metric, 'h', hour), self.hourly_retention),
+                (self._key(metric, 'd', hour // 24), self.daily_retention),
+            ):
+                cache.add(key, 0, timeout=timeout)
+                cache.incr(key, delta)
+        except Exception as e:
+            # The ledger stays authoritative; a rebuild repairs the buckets
+            print(f"Rollup update failed for {metric}: {str(e)}")
+    
+    def total(self, metric, start, end=None):
+        """Sum of `metric` over [start, end), to hour granularity"""
+        first_hour = int(start.timestamp() // HOUR)
+        last_hour = math.ceil((end or timezone.now()).timestamp() / HOUR)
+        
+        # Whole days come from daily buckets, the partial days at either edge from hourly ones
+        first_day = math.ceil(first_hour / 24)
+        last_day = last_hour // 24
+        if first_day < last_day:
+            keys = (
+                [self._key(metric, 'h', hour) for hour in range(first_hour, first_day * 24)]
+                + [self._key(metric, 'd', day) for day in range(first_day, last_day)]
+                + [self._key(metric, 'h', hour) for hour in range(last_day * 24, last_hour)]
+            )
+        else:
+            keys = [self._key(metric, 'h', hour) for hour in range(first_hour, last_hour)]
+        
+        units = sum(cache.get_many(keys).values())
+        return self._from_units(metric, units)
+    
+    def covers(self, start):
+        """True if the buckets have been complete since `start` (after a rebuild)"""
+        since = cache.get(f"{self.prefix}:since")
+        return since is not None and since <= start.timestamp()
+    
+    def ensure_coverage(self, start):
+        """Rebuild from the ledger once if the buckets do not reach back to `start`"""
+        if not self.covers(start):
+            self.rebuild(start)
+    
+    def rebuild(self, start, end=None):
+        """Recompute every bucket from the day containing `start` up to `end` from the database"""
+        from .models import Payout
+        from ..users.models import User
+        
+        # Start on a day boundary so the daily buckets are rebuilt whole
+        start = datetime.fromtimestamp(start.timestamp() // DAY * DAY, tz=start.tzinfo)
+        end = end or timezone.now()
+        sources = {
+            'paid_registrations': User.objects.filter(payment_status='paid', date_joined__gte=start, date_joined__lt=end)
+                .annotate(hour=TruncHour('date_joined')).values('hour').annotate(total=Count('id')),
+            'payouts': Payout.objects.filter(created_at__gte=start, created_at__lt=end)
+                .annotate(hour=TruncHour('created_at')).values('hour').annotate(total=Sum('amount')),
+        }
+        
+        # Events recorded while this runs may be overwritten; rebuilds are for cold or repaired caches
+        first_hour = int(start.timestamp() // HOUR)
+        last_hour = math.ceil(end.timestamp() / HOUR)
+        for metric, rows in sources.items():
+            hourly = dict.fromkeys(range(first_hour, last_hour), 0)
+            for row in rows:
+                hourly[int(row['hour'].timestamp() // HOUR)] = self._to_units(metric, row['total'] or 0)
+            
+            daily = {}
+            for hour, units in hourly.items():
+                daily[hour // 24] = daily.get(hour // 24, 0) + units
+            
+            cache.set_many({self._key(metric, 'h', hour): units for hour, units in hourly.items()},
+                           timeout=self.hourly_retention)
+            cache.set_many({self._key(metric, 'd', day): units for day, units in daily.items()},
+                           timeout=self.daily_retention)
+        
+        since = cache.get(f"{self.prefix}:since")
+        if since is None or start.timestamp() < since:
+            cache.set(f"{self.prefix}:since", start.timestamp(), timeout=self.hourly_retention)
+    
+    def _key(self, metric, granularity, index):
+        return f"{self.prefix}:{metric}:{granularity}:{index}"
+    
+    @staticmethod
+    def _to_units(metric, amount):
+        return int(round(Decimal(str(amount)) * METRICS[metric]))
+    
+    @staticmethod
+    def _from_units(metric, units):
+        scale = METRICS[metric]
+        return units if scale == 1 else Decimal(units) / scale
+
+_revenue_rollup = None
+
+def get_revenue_rollup():
+    """Return the process-wide revenue rollup"""
+    global _revenue_rollup
+    if _revenue_rollup is None:
+        _revenue_rollup = RevenueRollup()
+    return _revenue_rollup
@@ -0,0 +1,162 @@
+"""
+Staged bulk resume ingestion: process-pool extraction and formatting, async LLM stages
+"""
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from ..users.models import User
+from .models import Resume
+from .resume_documents import extract_resume_text, format_resume_content
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as upload:
+        for chunk in iter(lambda: upload.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ResumeIngestionPipeline:
+    """Extract -> analyze/optimize -> format/save, with bounded queues between stages"""
+    
+    def __init__(self, rewriter, workers=None, llm_concurrency=None, queue_size=None, cache_timeout=None):
+        # Extraction and formatting use the same helpers as the rewriter, run in worker processes
+        self.rewriter = rewriter
+        self.workers = workers or os.cpu_count() or 2
+        self.llm_concurrency = llm_concurrency or getattr(settings, 'RESUME_PIPELINE_LLM_CONCURRENCY', 16)
+        self.queue_size = queue_size or getattr(settings, 'RESUME_PIPELINE_QUEUE_SIZE', 64)
+        self.cache_timeout = cache_timeout or getattr(settings, 'RESUME_DEDUP_TIMEOUT', 30 * 24 * 3600)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.stats = {'processed': 0, 'duplicates': 0, 'failed': 0}
+        
+        # Digest -> future for uploads whose analysis is still running, so copies in one batch share it
+        self._inflight = {}
+    
+    async def run(self, uploads):
+        """Ingest (user_id, resume_path, photo_path) uploads; returns Resumes or exceptions in order"""
+        uploads = list(uploads)
+        results = [None] * len(uploads)
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(3)]
+        stages = [
+            (self.extract, self.workers, queues[0], queues[1]),
+            (self.optimize, self.llm_concurrency, queues[1], queues[2]),
+            (self.format_and_save, self.workers, queues[2], None),
+        ]
+        
+        tasks = [
+            asyncio.create_task(self._stage_worker(stage, inbox, outbox, results))
+            for stage, concurrency, inbox, outbox in stages
+            for _ in range(concurrency)
+        ]
+        try:
+            for index, (user_id, resume_path, photo_path) in enumerate(uploads):
+                await queues[0].put((index, {
+                    'user_id': user_id,
+                    'path': resume_path,
+                    'photo_path': photo_path
+                }))
+            
+            # Items reach the next queue before task_done, so joining in order drains the pipeline
+            for queue in queues:
+                await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return results
+    
+    async def _stage_worker(self, stage, inbox, outbox, results):
+        while True:
+            index, item = await inbox.get()
+            try:
+                item = await stage(item)
+                if outbox is None:
+                    results[index] = item
+                    self.stats['processed'] += 1
+                else:
+                    await outbox.put((index, item))
+            except Exception as e:
+                print(f"Resume ingestion failed for {item['path']}: {str(e)}")
+                results[index] = e
+                self.stats['failed'] += 1
+            finally:
+                inbox.task_done()
+    
+    async def extract(self, item):
+        """Hash the upload and extract its text, unless this CV was already processed"""
+        item['user'] = await User.objects.aget(id=item['user_id'])
+        item['digest'] = await asyncio.to_thread(file_digest, item['path'])
+        
+        known = await sync_to_async(cache.get)(self._cache_key(item['digest']))
+        if known is None and item['digest'] in self._inflight:
+            known = await self._inflight[item['digest']]
+        
+        if known is not None:
+            self.stats['duplicates'] += 1
+            item.update(known)
+            return item
+        
+        self._inflight[item['digest']] = asyncio.get_running_loop().create_future()
+        try:
+            item['text'] = await asyncio.get_running_loop().run_in_executor(
+                self.executor, extract_resume_text, item['path']
+            )
+        except Exception:
+            self._release(item['digest'], None)
+            raise
+        return item
+    
+    async def optimize(self, item):
+        """Analyze (for new CVs) and optimize through the LLM"""
+        if 'analysis' not in item:
+            known = None
+            try:
+                item['analysis'] = await self.rewriter.analyze_resume(item['text'])
+                known = {'text': item['text'], 'analysis': item['analysis']}
+                await sync_to_async(cache.set)(self._cache_key(item['digest']), known, timeout=self.cache_timeout)
+            finally:
+                self._release(item['digest'], known)
+        
+        item['optimized'] = await self.rewriter.generate_optimized_resume(
+            item['text'],
+            item['analysis'],
+            item['user'].qualifications
+        )
+        return item
+    
+    async def format_and_save(self, item):
+        """Format the optimized resume in the process pool and store it, as `ResumeRewriter.rewrite_resume` does"""
+        user = item['user']
+        formatted = await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            format_resume_content,
+            item['optimized'],
+            user.get_full_name() or user.username,
+            item['photo_path']
+        )
+        
+        return await Resume.objects.acreate(
+            user=user,
+            original_file=item['path'],
+            optimized_content=formatted,
+            analysis_metadata=item['analysis'],
+            is_available=True
+        )
+    
+    def close(self):
+        self.executor.shutdown(wait=True)
+    
+    def _release(self, digest, known):
+        """Wake uploads waiting on this digest; on failure (None) they process it themselves"""
+        future = self._inflight.pop(digest, None)
+        if future is not None and not future.done():
+            future.set_result(known)
+    
+    @staticmethod
+    def _cache_key(digest):
+        return f"resume_ingest_{digest}"
@@ -0,0 +1,35 @@
+"""
+Resume text extraction and formatting shared by single rewrites and the bulk pipeline
+"""
+import os
+
+def extract_resume_text(path):
+    """Extract plain text from a PDF, DOCX or text CV (picklable, so it can run in a process pool)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pdf':
+        from pypdf import PdfReader
+        return "\n".join(page.extract_text() or '' for page in PdfReader(path).pages)
+    if extension == '.docx':
+        import docx
+        return "\n".join(paragraph.text for paragraph in docx.Document(path).paragraphs)
+    with open(path, encoding='utf-8', errors='ignore') as upload:
+        return upload.read()
+
+def format_resume_content(content, full_name, photo_path=None):
+    """Lay out optimized resume text with consistent headings and bullets (picklable)"""
+    lines = [f"# {full_name}"]
+    if photo_path:
+        lines.append(f"![Photo]({photo_path})")
+    
+    for line in content.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('#') or (line.isupper() and len(line) < 60):
+            lines.extend(['', f"## {line.lstrip('# ').title()}"])
+        elif line.startswith(('- ', '* ', '• ')):
+            lines.append(f"- {line[2:].strip()}")
+        else:
+            lines.append(line)
+    
+    return "\n".join(lines) + "\n"
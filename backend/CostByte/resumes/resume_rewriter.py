@@ -1,17 +1,18 @@
 """
 AI-powered resume/CV rewriting system
 """
-import openai
-from django.conf import settings
+import asyncio
 from ..ai_models.model_trainer import ModelTrainer
+from ..ai_models.llm_gateway import get_llm_gateway
 from .models import Resume, UserDocument
+from .ingestion_pipeline import ResumeIngestionPipeline
+from .resume_documents import extract_resume_text, format_resume_content
 
 class ResumeRewriter:
     """Rewrite and optimize resumes using AI"""
     
     def __init__(self):
         self.model_trainer = ModelTrainer()
-        self.openai_client = openai.Client(api_key=settings.OPENAI_API_KEY)
     
     async def rewrite_resume(self, user_id, original_resume_path, photo_path=None):
         """Rewrite user's resume using AI"""
@@ -44,6 +45,22 @@ class ResumeRewriter:
         
         return new_resume
     
+    async def rewrite_resumes(self, uploads):
+        """Bulk-rewrite (user_id, resume_path, photo_path) uploads through the staged pipeline"""
+        pipeline = ResumeIngestionPipeline(self)
+        try:
+            return await pipeline.run(uploads)
+        finally:
+            pipeline.close()
+    
+    async def extract_resume_text(self, resume_path):
+        """Extract plain text from an uploaded resume"""
+        return await asyncio.to_thread(extract_resume_text, resume_path)
+    
+    async def format_resume(self, content, user, photo_path=None):
+        """Format optimized resume content for storage"""
+        return format_resume_content(content, user.get_full_name() or user.username, photo_path)
+    
     async def create_resume_from_scratch(self, user_id, user_data, photo_path=None):
         """Create resume for users without one"""
         user = User.objects.get(id=user_id)
@@ -83,10 +100,9 @@ class ResumeRewriter:
         5. Is 1-2 pages maximum
         """
         
-        response = await self.openai_client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
+        # Shared gateway: pooled connections, rate limits, retries and response cache
+        return await get_llm_gateway().complete(
+            "gpt-4",
+            [{"role": "user", "content": prompt}],
             max_tokens=2000
         )
-        
-        return response.choices[0].message.content
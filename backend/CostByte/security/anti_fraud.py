@@ -1,30 +1,45 @@
 """
 Military-grade anti-fraud system
 """
+import asyncio
 import hashlib
 import hmac
+import time
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from django.conf import settings
-from django.core.cache import cache
+from .blacklist import BlacklistIndex
+from .velocity import SlidingWindowCounter
 
 class AntiFraudSystem:
     """Advanced fraud detection and prevention"""
     
     def __init__(self):
         self.suspicious_patterns = self.load_fraud_patterns()
+        self.blacklist = BlacklistIndex.build(self.suspicious_patterns)
         self.rate_limits = {}
+        self.check_timeout = getattr(settings, 'FRAUD_CHECK_TIMEOUT', 0.5)
+        self.check_latencies = defaultdict(lambda: deque(maxlen=1000))
+        # One-hour sliding window in one-minute buckets, synced with the shared cache
+        self.velocity_counter = SlidingWindowCounter(
+            'transactions',
+            window=3600,
+            buckets=60,
+            sync_interval=getattr(settings, 'VELOCITY_SYNC_INTERVAL', 1.0),
+            flush_interval=getattr(settings, 'VELOCITY_FLUSH_INTERVAL', 0.1)
+        )
     
     async def detect_payment_fraud(self, payment_data):
         """Detect payment fraud in real-time"""
-        checks = [
-            self.check_velocity(payment_data),
-            self.check_geolocation(payment_data),
-            self.check_device_fingerprint(payment_data),
-            self.check_behavioral_analysis(payment_data),
-            self.check_blacklist(payment_data)
-        ]
+        checks = {
+            'velocity': self.check_velocity,
+            'geolocation': self.check_geolocation,
+            'device_fingerprint': self.check_device_fingerprint,
+            'behavioral_analysis': self.check_behavioral_analysis,
+            'blacklist': self.check_blacklist
+        }
         
-        fraud_score = sum(checks)
+        fraud_score = await self.run_fraud_checks(checks, payment_data)
         
         if fraud_score >= settings.FRAUD_THRESHOLD:
             await self.block_transaction(payment_data)
@@ -32,24 +47,111 @@ class AntiFraudSystem:
         
         return False
     
+    async def run_fraud_checks(self, checks, payment_data):
+        """Run checks concurrently, stopping as soon as the score reaches the threshold"""
+        tasks = [
+            asyncio.ensure_future(self.timed_check(name, check, payment_data))
+            for name, check in checks.items()
+        ]
+        
+        fraud_score = 0
+        try:
+            for finished in asyncio.as_completed(tasks):
+                fraud_score += await finished
+                if fraud_score >= settings.FRAUD_THRESHOLD:
+                    break
+        finally:
+            # Checks still running cannot change the outcome
+            for task in tasks:
+                task.cancel()
+        
+        return fraud_score
+    
+    async def timed_check(self, name, check, payment_data):
+        """Run one check under the per-check timeout and record its latency"""
+        started = time.perf_counter()
+        try:
+            score = await asyncio.wait_for(check(payment_data), timeout=self.check_timeout)
+        except asyncio.TimeoutError:
+            print(f"Fraud check {name} timed out after {self.check_timeout}s")
+            score = 0
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Fraud check {name} failed: {str(e)}")
+            score = 0
+        
+        self.check_latencies[name].append(time.perf_counter() - started)
+        return score
+    
+    def check_latency_stats(self):
+        """p50/p99 latency in milliseconds for each check"""
+        stats = {}
+        for name, samples in self.check_latencies.items():
+            ordered = sorted(samples)
+            if ordered:
+                stats[name] = {
+                    'p50_ms': ordered[len(ordered) // 2] * 1000,
+                    'p99_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+                    'samples': len(ordered)
+                }
+        return stats
+    
     async def check_velocity(self, payment_data):
         """Check transaction velocity patterns"""
         user_ip = payment_data.get('ip_address')
         user_email = payment_data.get('email')
         
-        # Check IP transactions in last hour
-        ip_key = f"transactions_ip_{user_ip}"
-        ip_count = cache.get(ip_key, 0)
+        # Record this attempt against the IP and the email; counting is local and I/O-free
+        ip_key, email_key = f"ip_{user_ip}", f"email_{user_email}"
+        counts, due = self.velocity_counter.record([ip_key, email_key])
+        if due:
+            # Keys that are new or due share one cache round trip, in a thread so the loop stays free
+            counts.update(await asyncio.to_thread(self.velocity_counter.sync, due))
         
-        # Check email transactions in last hour
-        email_key = f"transactions_email_{user_email}"
-        email_count = cache.get(email_key, 0)
+        # Earlier transactions in the last hour
+        ip_count = counts[ip_key] - 1
+        email_count = counts[email_key] - 1
         
         if ip_count > 5 or email_count > 3:
             return 0.8
         
         return 0
     
+    async def check_blacklist(self, payment_data):
+        """Check IP, email, device fingerprint and card BIN against the blacklist"""
+        # Read the reference once so a concurrent reload cannot change it mid-check
+        blacklist = self.blacklist
+        
+        lookups = [
+            ('ip', payment_data.get('ip_address')),
+            ('email', payment_data.get('email')),
+            ('device_fingerprint', payment_data.get('device_fingerprint')),
+            ('card_bin', payment_data.get('card_bin') or payment_data.get('card_number'))
+        ]
+        
+        for kind, value in lookups:
+            if value and blacklist.contains(kind, value):
+                return 1.0
+        
+        return 0
+    
+    async def reload_blacklist(self):
+        """Rebuild the blacklist off the event loop and swap it in atomically"""
+        patterns = await asyncio.to_thread(self.load_fraud_patterns)
+        blacklist = await asyncio.to_thread(BlacklistIndex.build, patterns)
+        
+        # Lookups keep using the old index until this single assignment
+        self.suspicious_patterns = patterns
+        self.blacklist = blacklist
+        return len(blacklist)
+    
+    def rescore_payments(self, start_date, end_date, chunk_size=50000):
+        """Offline batch rescoring of historical payments after rule changes"""
+        # Imported here: batch rescoring needs users.models, which the live checks don't
+        from .batch_rescoring import FraudRescorer
+        return FraudRescorer(self, chunk_size=chunk_size).rescore(start_date, end_date)
+    
     async def self_heal_system(self):
         """Self-healing security system"""
         # Monitor system health
@@ -0,0 +1,135 @@
+"""
+Offline, vectorized fraud rescoring over payment history
+"""
+import time
+import numpy as np
+from django.conf import settings
+from ..users.models import Payment
+
+# Column name -> Payment lookup used to build it
+DEFAULT_FEATURE_FIELDS = {
+    'ip_address': 'ip_address',
+    'email': 'user__email',
+    'device_fingerprint': 'device_fingerprint',
+    'card_bin': 'card_bin',
+}
+
+VELOCITY_WINDOW = 3600
+
+def rolling_counts(keys, timestamps, window=VELOCITY_WINDOW):
+    """For each row, count earlier rows with the same key within `window` seconds"""
+    if len(keys) == 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    _, codes = np.unique(keys, return_inverse=True)
+    codes = codes.ravel()
+    order = np.lexsort((timestamps, codes))
+    
+    # Encode (key, time) as one sortable float so a single searchsorted finds window starts
+    span = timestamps.max() - timestamps.min() + window + 1
+    composite = codes[order] * span + (timestamps[order] - timestamps.min())
+    window_start = np.searchsorted(composite, composite - window, side='left')
+    
+    counts = np.empty(len(keys), dtype=np.int64)
+    counts[order] = np.arange(len(keys)) - window_start
+    # Missing values are not a shared identity
+    counts[keys == ''] = 0
+    return counts
+
+class FraudRescorer:
+    """Stream payments in chunks, score each chunk as NumPy columns and write back in bulk"""
+    
+    def __init__(self, fraud_system, chunk_size=50000, feature_fields=None, extra_scorers=()):
+        self.fraud_system = fraud_system
+        self.chunk_size = chunk_size
+        self.feature_fields = feature_fields or getattr(
+            settings, 'FRAUD_RESCORE_FIELDS', DEFAULT_FEATURE_FIELDS
+        )
+        # Callables taking the column dict and returning a score array
+        self.extra_scorers = list(extra_scorers)
+    
+    def rescore(self, start_date, end_date):
+        """Rescore all payments created in [start_date, end_date); returns summary stats"""
+        lookups = ['id', 'created_at'] + list(self.feature_fields.values())
+        payments = Payment.objects.filter(
+            created_at__gte=start_date,
+            created_at__lt=end_date
+        ).order_by('created_at', 'id').values_list(*lookups)
+        
+        started = time.perf_counter()
+        summary = {'payments': 0, 'flagged': 0}
+        carry = None
+        rows = []
+        
+        for row in payments.iterator(chunk_size=self.chunk_size):
+            rows.append(row)
+            if len(rows) >= self.chunk_size:
+                carry = self._process_chunk(rows, carry, summary)
+                rows = []
+        if rows:
+            self._process_chunk(rows, carry, summary)
+        
+        summary['seconds'] = time.perf_counter() - started
+        return summary
+    
+    def _process_chunk(self, rows, carry, summary):
+        columns = self._to_columns(rows)
+        history = self._prepend(carry, columns)
+        offset = len(history['id']) - len(columns['id'])
+        
+        scores = self.score_columns(history)[offset:]
+        flagged = scores >= settings.FRAUD_THRESHOLD
+        
+        Payment.objects.bulk_update(
+            [
+                Payment(id=payment_id, fraud_score=float(score), flagged_as_fraud=bool(flag))
+                for payment_id, score, flag in zip(columns['id'].tolist(), scores, flagged)
+            ],
+            ['fraud_score', 'flagged_as_fraud'],
+            batch_size=5000
+        )
+        
+        summary['payments'] += len(scores)
+        summary['flagged'] += int(flagged.sum())
+        
+        # Keep the last velocity window so counts are exact across chunk boundaries
+        recent = history['created_at'] >= history['created_at'].max() - VELOCITY_WINDOW
+        return {name: column[recent] for name, column in history.items()}
+    
+    def score_columns(self, columns):
+        """Vectorized equivalent of the per-payment checks"""
+        scores = np.zeros(len(columns['id']), dtype=np.float64)
+        
+        # Velocity: same thresholds as check_velocity, counting earlier payments in the hour
+        ip_counts = rolling_counts(columns['ip_address'], columns['created_at'])
+        email_counts = rolling_counts(columns['email'], columns['created_at'])
+        scores += np.where((ip_counts > 5) | (email_counts > 3), 0.8, 0.0)
+        
+        # Blacklist: any blacklisted dimension scores 1.0, as in check_blacklist
+        blacklist = self.fraud_system.blacklist
+        hit = np.zeros(len(scores), dtype=bool)
+        for kind, column in (('ip', 'ip_address'), ('email', 'email'),
+                             ('device_fingerprint', 'device_fingerprint'), ('card_bin', 'card_bin')):
+            hit |= blacklist.contains_many(kind, columns[column])
+        scores += np.where(hit, 1.0, 0.0)
+        
+        for scorer in self.extra_scorers:
+            scores += scorer(columns)
+        
+        return scores
+    
+    def _to_columns(self, rows):
+        ids, created, *features = zip(*rows)
+        columns = {
+            'id': np.asarray(ids, dtype=np.int64),
+            'created_at': np.asarray([value.timestamp() for value in created], dtype=np.float64),
+        }
+        for name, values in zip(self.feature_fields, features):
+            columns[name] = np.asarray(['' if value is None else str(value) for value in values], dtype=object)
+        return columns
+    
+    @staticmethod
+    def _prepend(carry, columns):
+        if carry is None:
+            return columns
+        return {name: np.concatenate([carry[name], column]) for name, column in columns.items()}
@@ -0,0 +1,165 @@
+"""
+Compact blacklist index for IPs, emails, device fingerprints and card BINs
+"""
+import bisect
+import hashlib
+import ipaddress
+import math
+import numpy as np
+
+KINDS = ('ip', 'email', 'device_fingerprint', 'card_bin')
+
+def _digest(kind, value):
+    """64-bit fingerprint of a normalised (kind, value) pair"""
+    data = f"{kind}\x00{value}".encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+def normalize(kind, value):
+    """Canonical form used for both indexing and lookups"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if kind == 'email':
+        return value.lower()
+    if kind == 'ip':
+        try:
+            return str(ipaddress.ip_address(value))
+        except ValueError:
+            return value
+    if kind == 'card_bin':
+        digits = ''.join(ch for ch in value if ch.isdigit())
+        return digits[:6] or None
+    return value
+
+class BloomFilter:
+    """Bit-array Bloom filter using double hashing over 64-bit fingerprints"""
+    
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+    
+    def _positions(self, fingerprints):
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        h1 = fingerprints & np.uint64(0xFFFFFFFF)
+        h2 = (fingerprints >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.num_bits)
+    
+    def add_many(self, fingerprints):
+        if len(fingerprints) == 0:
+            return
+        positions = self._positions(fingerprints).ravel()
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), (1 << (positions & np.uint64(7))).astype(np.uint8))
+    
+    def __contains__(self, fingerprint):
+        positions = self._positions([fingerprint])[0]
+        bytes_ = self.bits[positions >> np.uint64(3)]
+        return bool(np.all(bytes_ & (1 << (positions & np.uint64(7))).astype(np.uint8)))
+
+class BlacklistIndex:
+    """Immutable index: Bloom filter in front of a sorted array of fingerprints, plus IP ranges"""
+    
+    def __init__(self, fingerprints, ip_ranges=()):
+        # 8 bytes per entry, so millions of entries fit comfortably on each worker
+        self.fingerprints = np.unique(np.asarray(fingerprints, dtype=np.uint64))
+        self.bloom = BloomFilter(len(self.fingerprints))
+        self.bloom.add_many(self.fingerprints)
+        
+        # Merged, sorted (start, end) integer ranges per IP version
+        self._range_starts = {}
+        self._range_ends = {}
+        for version, ranges in self._merge_ranges(ip_ranges).items():
+            self._range_starts[version] = [start for start, _ in ranges]
+            self._range_ends[version] = [end for _, end in ranges]
+    
+    @classmethod
+    def build(cls, entries):
+        """Build from {kind: iterable of values}; IP values may be CIDR networks"""
+        fingerprints = []
+        ip_ranges = []
+        for kind in KINDS:
+            for value in entries.get(kind, ()):
+                if kind == 'ip' and '/' in str(value):
+                    network = ipaddress.ip_network(str(value).strip(), strict=False)
+                    ip_ranges.append(network)
+                    continue
+                value = normalize(kind, value)
+                if value:
+                    fingerprints.append(_digest(kind, value))
+        return cls(fingerprints, ip_ranges)
+    
+    def __len__(self):
+        return len(self.fingerprints)
+    
+    def contains(self, kind, value):
+        """O(1) expected membership check (Bloom filter, then exact confirmation)"""
+        value = normalize(kind, value)
+        if not value:
+            return False
+        
+        if kind == 'ip' and self._in_ip_ranges(value):
+            return True
+        
+        fingerprint = _digest(kind, value)
+        if fingerprint not in self.bloom:
+            return False
+        position = np.searchsorted(self.fingerprints, np.uint64(fingerprint))
+        return position < len(self.fingerprints) and int(self.fingerprints[position]) == fingerprint
+    
+    def contains_many(self, kind, values):
+        """Vectorized membership for a column of values; returns a bool array"""
+        normalized = [normalize(kind, value) for value in values]
+        fingerprints = np.fromiter(
+            (_digest(kind, value) if value else 0 for value in normalized),
+            dtype=np.uint64,
+            count=len(normalized)
+        )
+        
+        found = np.zeros(len(normalized), dtype=bool)
+        if len(self.fingerprints):
+            positions = np.searchsorted(self.fingerprints, fingerprints)
+            positions = np.minimum(positions, len(self.fingerprints) - 1)
+            found = self.fingerprints[positions] == fingerprints
+        found &= np.fromiter((bool(value) for value in normalized), dtype=bool, count=len(normalized))
+        
+        if kind == 'ip' and self._range_starts:
+            found |= np.fromiter(
+                (bool(value) and self._in_ip_ranges(value) for value in normalized),
+                dtype=bool,
+                count=len(normalized)
+            )
+        return found
+    
+    def _in_ip_ranges(self, value):
+        try:
+            address = ipaddress.ip_address(value)
+        except ValueError:
+            return False
+        
+        starts = self._range_starts.get(address.version)
+        if not starts:
+            return False
+        position = bisect.bisect_right(starts, int(address)) - 1
+        return position >= 0 and int(address) <= self._range_ends[address.version][position]
+    
+    @staticmethod
+    def _merge_ranges(networks):
+        by_version = {}
+        for network in networks:
+            by_version.setdefault(network.version, []).append(
+                (int(network.network_address), int(network.broadcast_address))
+            )
+        
+        merged = {}
+        for version, ranges in by_version.items():
+            ranges.sort()
+            result = [ranges[0]]
+            for start, end in ranges[1:]:
+                if start <= result[-1][1] + 1:
+                    result[-1] = (result[-1][0], max(result[-1][1], end))
+                else:
+                    result.append((start, end))
+            merged[version] = result
+        return merged
@@ -0,0 +1,206 @@
+"""
+Sliding-window rate counters for transaction velocity checks
+"""
+import threading
+import time
+from django.core.cache import cache
+
+class _WindowState:
+    """Bucketed ring buffers for one counter key"""
+    
+    __slots__ = ('epochs', 'local', 'pending', 'remote', 'synced_at', 'last_seen')
+    
+    def __init__(self, buckets):
+        self.epochs = [-1] * buckets
+        self.local = [0] * buckets    # this worker's events not yet reflected in `remote`
+        self.pending = [0] * buckets  # this worker's events not yet flushed to the cache
+        self.remote = [0] * buckets   # all workers' flushed events as of the last sync
+        self.synced_at = 0.0
+        self.last_seen = 0.0
+
+class SlidingWindowCounter:
+    """Per-key event counts over a sliding window, shared across workers through the cache"""
+    
+    def __init__(self, prefix, window=3600, buckets=60, sync_interval=1.0, idle_timeout=None, flush_interval=None):
+        self.prefix = prefix
+        self.window = window
+        self.buckets = buckets
+        self.bucket_seconds = window / buckets
+        self.sync_interval = sync_interval
+        self.flush_interval = flush_interval or sync_interval
+        self.idle_timeout = idle_timeout or 2 * window
+        
+        self._states = {}
+        self._lock = threading.Lock()
+        self._operations = 0
+        
+        # Pushes every key's pending counts to the cache, so other workers see them even if this
+        # worker never sees the key again; started on first use
+        self._flusher = None
+        self._stopped = threading.Event()
+    
+    def increment_and_count(self, key, amount=1, now=None):
+        """Atomically record `amount` events and return the window total including them"""
+        totals, due = self.record([key], amount, now)
+        if due:
+            totals.update(self.sync(due, now))
+        return totals[key]
+    
+    def record(self, keys, amount=1, now=None):
+        """Record events for several keys without I/O; returns ({key: total}, keys due for a sync)"""
+        if self._flusher is None:
+            self.start()
+        now = now or time.time()
+        epoch = int(now // self.bucket_seconds)
+        totals, due = {}, []
+        
+        with self._lock:
+            for key in keys:
+                state = self._states.get(key)
+                if state is None:
+                    state = self._states[key] = _WindowState(self.buckets)
+                
+                slot = self._advance(state, epoch)
+                state.local[slot] += amount
+                state.pending[slot] += amount
+                state.last_seen = now
+                totals[key] = self._total(state, epoch)
+                if now - state.synced_at >= self.sync_interval:
+                    # Claim the sync so concurrent callers keep using the fast path
+                    state.synced_at = now
+                    due.append(key)
+            
+            self._operations += len(keys)
+            if self._operations >= 1000:
+                self._operations = 0
+                self._evict_idle(now)
+        
+        return totals, due
+    
+    def start(self):
+        """Start the background flush thread"""
+        with self._lock:
+            if self._flusher is None:
+                self._stopped.clear()
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name=f"velocity-flush-{self.prefix}", daemon=True
+                )
+                self._flusher.start()
+    
+    def flush(self, now=None):
+        """Sync keys with unflushed counts or recent activity, then drop idle keys with nothing to flush"""
+        now = now or time.time()
+        with self._lock:
+            keys = [
+                key for key, state in self._states.items()
+                if any(state.pending) or now - state.last_seen < self.sync_interval
+            ]
+        if keys:
+            self.sync(keys, now)
+        with self._lock:
+            self._evict_idle(now)
+    
+    def close(self):
+        """Stop the flush thread and push the remaining counts"""
+        self._stopped.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+    
+    def count(self, key, now=None):
+        """Return the window total without recording an event"""
+        now = now or time.time()
+        epoch = int(now // self.bucket_seconds)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                return 0
+            self._advance(state, epoch)
+            return self._total(state, epoch)
+    
+    def _advance(self, state, epoch):
+        """Reset the ring slot for `epoch` if it still holds an older bucket"""
+        slot = epoch % self.buckets
+        if state.epochs[slot] != epoch:
+            state.epochs[slot] = epoch
+            state.local[slot] = 0
+            state.pending[slot] = 0
+            state.remote[slot] = 0
+        return slot
+    
+    def _total(self, state, epoch):
+        oldest = epoch - self.buckets + 1
+        return sum(
+            state.remote[slot] + state.local[slot]
+            for slot in range(self.buckets)
+            if state.epochs[slot] >= oldest
+        )
+    
+    def sync(self, keys, now=None):
+        """Flush pending counts for `keys` and pull every worker's totals in one batch; returns {key: total}"""
+        now = now or time.time()
+        epoch = int(now // self.bucket_seconds)
+        oldest = epoch - self.buckets + 1
+        
+        with self._lock:
+            states = {key: self._states[key] for key in keys if key in self._states}
+            flush = []
+            for key, state in states.items():
+                for slot in range(self.buckets):
+                    if state.pending[slot]:
+                        flush.append((key, state.epochs[slot], state.pending[slot]))
+                        state.pending[slot] = 0
+        
+        # One pass over the cache for all keys: increments, then a single multi-get
+        cache_keys = {
+            self._cache_key(key, bucket_epoch): (key, bucket_epoch)
+            for key in states
+            for bucket_epoch in range(oldest, epoch + 1)
+        }
+        try:
+            for key, bucket_epoch, delta in flush:
+                cache_key = self._cache_key(key, bucket_epoch)
+                cache.add(cache_key, 0, timeout=self.window + self.bucket_seconds)
+                cache.incr(cache_key, delta)
+            shared = cache.get_many(list(cache_keys))
+        except Exception as e:
+            # Keep counting locally; the counts are retried on the next sync
+            print(f"Velocity counter sync failed for {', '.join(states)}: {str(e)}")
+            with self._lock:
+                for key, bucket_epoch, delta in flush:
+                    state = states[key]
+                    slot = bucket_epoch % self.buckets
+                    if state.epochs[slot] == bucket_epoch:
+                        state.pending[slot] += delta
+                return {key: self._total(state, epoch) for key, state in states.items()}
+        
+        with self._lock:
+            for cache_key, (key, bucket_epoch) in cache_keys.items():
+                state = states[key]
+                slot = bucket_epoch % self.buckets
+                if state.epochs[slot] != bucket_epoch:
+                    continue
+                state.remote[slot] = shared.get(cache_key, 0)
+                # Local events are now in `remote`, except those recorded during the sync
+                state.local[slot] = state.pending[slot]
+            return {key: self._total(state, epoch) for key, state in states.items()}
+    
+    def _flush_loop(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Velocity counter flush failed: {str(e)}")
+    
+    def _evict_idle(self, now):
+        # Keys with unflushed counts stay until the flush thread has pushed them
+        idle = [
+            key for key, state in self._states.items()
+            if now - state.last_seen > self.idle_timeout and not any(state.pending)
+        ]
+        for key in idle:
+            del self._states[key]
+    
+    def _cache_key(self, key, bucket_epoch):
+        return f"{self.prefix}:{key}:{bucket_epoch}"
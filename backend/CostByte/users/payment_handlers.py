@@ -1,50 +1,25 @@
 """
 Payment processing for user registration (R500)
 """
-from django.conf import settings
+from asgiref.sync import sync_to_async
 from .models import User, Payment
-from ..payments.payment_processors import (
-    EFTProcessor, 
-    PayFastProcessor, 
-    PayShapProcessor
-)
+from ..payments.processor_registry import get_processor_registry
+from ..payments.rollups import get_revenue_rollup
 
 class RegistrationPaymentHandler:
     """Handle R500 registration payments"""
     
     def __init__(self):
-        self.eft_processor = EFTProcessor()
-        self.payfast_processor = PayFastProcessor()
-        self.payshap_processor = PayShapProcessor()
-        self.fnb_account = settings.FNB_BUSINESS_ZERO_ACCOUNT
+        # Processors and their HTTP sessions are shared across handlers
+        self.processors = get_processor_registry()
     
     async def process_registration_payment(self, user_id, payment_method, amount=500):
         """Process R500 registration payment"""
-        user = User.objects.get(id=user_id)
-        
-        if payment_method == 'eft':
-            result = await self.eft_processor.process_payment(
-                amount=amount,
-                account=self.fnb_account,
-                reference=f"REG_{user.id}"
-            )
-        elif payment_method == 'payfast':
-            result = await self.payfast_processor.process_payment(
-                amount=amount,
-                buyer=user,
-                return_url=settings.PAYMENT_RETURN_URL
-            )
-        elif payment_method == 'payshap':
-            result = await self.payshap_processor.process_payment(
-                amount=amount,
-                recipient=self.fnb_account,
-                reference=f"REG_{user.id}"
-            )
-        else:
-            raise ValueError("Unsupported payment method")
+        user = await User.objects.aget(id=user_id)
+        result = await self.processors.process_payment(payment_method, user, amount)
         
         # Create payment record
-        payment = Payment.objects.create(
+        payment = await Payment.objects.acreate(
             user=user,
             amount=amount,
             payment_method=payment_method,
@@ -53,6 +28,8 @@ class RegistrationPaymentHandler:
         )
         
         if result.success:
+            rollup = get_revenue_rollup()
+            await sync_to_async(rollup.record)('paid_registrations')
             await self.activate_user_account(user)
         
         return payment
@@ -61,7 +38,7 @@ class RegistrationPaymentHandler:
         """Activate user account after successful payment"""
         user.is_active = True
         user.payment_status = 'paid'
-        user.save()
+        await user.asave(update_fields=['is_active', 'payment_status'])
         
         # Trigger resume processing
         await self.process_user_documents(user)
@@ -0,0 +1,203 @@
+"""
+Bounded agent memory with LRU/TTL eviction and an on-disk spill tier.
+"""
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+import uuid
+import weakref
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+# Spilled values larger than this many pickled bytes are stored zlib-compressed
+COMPRESS_THRESHOLD = 512
+
+def _remove_spill_file(db: sqlite3.Connection, path: str) -> None:
+    """Close a spill database and delete its files (also run by the finalizer)."""
+    db.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+class AgentMemory(MutableMapping):
+    """Dict-like memory that keeps hot entries in RAM and spills the rest to SQLite."""
+    
+    def __init__(self, name: str, config: Dict[str, Any] = None):
+        config = config or {}
+        self.name = name
+        self.max_entries = int(config.get('max_entries', 10000))
+        self.ttl = config.get('ttl')
+        self.spill_enabled = config.get('spill', True)
+        self.spill_dir = config.get('spill_dir') or tempfile.gettempdir()
+        
+        # key -> (expires_at, value); most recently used last. Values stay live objects so
+        # in-place mutation behaves as with a dict; they are only pickled when spilled
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+        self._finalizer: Optional[weakref.finalize] = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0,
+                      "expirations": 0, "spills": 0, "disk_hits": 0, "unspillable": 0}
+    
+    def __getitem__(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._expired(entry):
+                del self._entries[key]
+                self.stats["expirations"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+        
+        # Fall back to the disk tier and promote the entry back into RAM
+        entry = self._load_spilled(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            raise KeyError(key)
+        
+        self.stats["hits"] += 1
+        self.stats["disk_hits"] += 1
+        self._store(key, entry)
+        return entry[1]
+    
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+    
+    def __delitem__(self, key: Hashable) -> None:
+        found = self._entries.pop(key, None) is not None
+        if self._db is not None:
+            cursor = self._db.execute("DELETE FROM memory WHERE key = ?", (self._key_bytes(key),))
+            found = found or cursor.rowcount > 0
+        if not found:
+            raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[Hashable]:
+        yield from list(self._entries)
+        if self._db is not None:
+            for (key,) in self._db.execute("SELECT key FROM memory").fetchall():
+                key = pickle.loads(key)
+                if key not in self._entries:
+                    yield key
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        if entry is not None and not self._expired(entry):
+            return True
+        return self._load_spilled(key, remove=False) is not None
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, optionally overriding the default TTL."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        self._store(key, (expires_at, value))
+    
+    def clear(self) -> None:
+        """Drop all entries from both tiers."""
+        self._entries.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM memory")
+    
+    def close(self) -> None:
+        """Close and remove the per-instance disk tier."""
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+            self._db = None
+    
+    def _store(self, key: Hashable, entry: Tuple[Optional[float], Any]) -> None:
+        """Insert into the RAM tier, evicting least recently used entries."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        
+        unspillable = []
+        while len(self._entries) > self.max_entries:
+            old_key, old_entry = self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+            if self.spill_enabled and not self._expired(old_entry) and not self._spill(old_key, old_entry):
+                unspillable.append((old_key, old_entry))
+        
+        # Values that cannot be pickled stay in RAM (least recently used first) rather than being lost
+        for old_key, old_entry in reversed(unspillable):
+            self._entries[old_key] = old_entry
+            self._entries.move_to_end(old_key, last=False)
+    
+    def _spill(self, key: Hashable, entry: Tuple[Optional[float], Any]) -> bool:
+        """Write an evicted entry to the disk tier; False if the value cannot be pickled."""
+        expires_at, value = entry
+        try:
+            compressed, payload = self._encode(value)
+        except Exception:
+            self.stats["unspillable"] += 1
+            return False
+        self._connection().execute(
+            "INSERT OR REPLACE INTO memory (key, expires_at, compressed, payload) VALUES (?, ?, ?, ?)",
+            (self._key_bytes(key), expires_at, int(compressed), payload)
+        )
+        self.stats["spills"] += 1
+        return True
+    
+    def _load_spilled(self, key: Hashable, remove: bool = True):
+        """Read an entry back from the disk tier, dropping it if expired."""
+        if self._db is None:
+            return None
+        
+        key_bytes = self._key_bytes(key)
+        row = self._db.execute(
+            "SELECT expires_at, compressed, payload FROM memory WHERE key = ?", (key_bytes,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        if self._expired((row[0], None)):
+            self._db.execute("DELETE FROM memory WHERE key = ?", (key_bytes,))
+            self.stats["expirations"] += 1
+            return None
+        
+        if remove:
+            self._db.execute("DELETE FROM memory WHERE key = ?", (key_bytes,))
+        return (row[0], self._decode(bool(row[1]), row[2]))
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Open the SQLite spill file on first use."""
+        if self._db is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            # Per instance, so same-named memories never share (or delete) each other's file
+            self._db_path = os.path.join(
+                self.spill_dir, f"{self.name}_{os.getpid()}_{uuid.uuid4().hex[:8]}.sqlite"
+            )
+            self._db = sqlite3.connect(self._db_path, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS memory "
+                "(key BLOB PRIMARY KEY, expires_at REAL, compressed INTEGER, payload BLOB)"
+            )
+            # Deletes the file when the memory is garbage collected or the interpreter exits
+            self._finalizer = weakref.finalize(self, _remove_spill_file, self._db, self._db_path)
+        return self._db
+    
+    @staticmethod
+    def _key_bytes(key: Hashable) -> bytes:
+        return pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    @staticmethod
+    def _encode(value: Any) -> Tuple[bool, bytes]:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > COMPRESS_THRESHOLD:
+            return True, zlib.compress(payload)
+        return False, payload
+    
+    @staticmethod
+    def _decode(compressed: bool, payload: bytes) -> Any:
+        return pickle.loads(zlib.decompress(payload) if compressed else payload)
+    
+    @staticmethod
+    def _expired(entry: Tuple[Optional[float], Any]) -> bool:
+        return entry[0] is not None and entry[0] <= time.time()
@@ -1,18 +1,33 @@
 """
 Base class for all AI agents in the CostByte system.
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
 from ..utils.logger import get_logger
+from .agent_memory import AgentMemory
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .experience_buffer import ExperienceBuffer
 
 class BaseAgent(ABC):
     """Abstract base class for AI agents."""
     
+    # Stateful agents keep per-process state (e.g. memory) and are pinned to one worker
+    stateful = False
+    
     def __init__(self, name: str, config: Dict[str, Any]):
         self.name = name
         self.config = config
         self.logger = get_logger(name)
-        self.memory = {}
+        # Bounded, dict-like memory; cold entries spill to disk
+        self.memory = AgentMemory(name, config.get('agents', {}).get('memory', {}))
+        # Experiences are appended cheaply and learned from in batches off the request path
+        self.experience_config = config.get('agents', {}).get('experience', {})
+        self.learn_batch_size = self.experience_config.get('learn_batch_size', 256)
+        self._experience: Optional["ExperienceBuffer"] = None
+        self._learning: Optional[asyncio.Task] = None
     
     @abstractmethod
     async def initialize(self) -> None:
@@ -29,6 +44,65 @@ class BaseAgent(ABC):
         """Learn from experience to improve future performance."""
         pass
     
+    @property
+    def experience(self) -> "ExperienceBuffer":
+        """Experience buffer, built on first use so NumPy only loads for agents that learn."""
+        if self._experience is None:
+            from .experience_buffer import ExperienceBuffer
+            self._experience = ExperienceBuffer.from_config(self.name, self.experience_config)
+        return self._experience
+    
+    def record_experience(self, label: str, value: float,
+                          features: Optional[Sequence[float]] = None) -> None:
+        """Append an experience and schedule batch learning once enough are pending."""
+        self.experience.append(label, value, features)
+        if self.experience.pending >= self.learn_batch_size:
+            self._schedule_learning()
+    
+    async def learn_batch(self, batch: "np.ndarray") -> None:
+        """Learn from a batch of buffered experiences (a structured array)."""
+        pass
+    
+    async def flush_learning(self) -> None:
+        """Learn from everything still pending, e.g. before shutdown."""
+        if self._learning is not None:
+            await self._learning
+        if self._experience is None:
+            return
+        batch = self.experience.drain()
+        if len(batch):
+            await self.learn_batch(batch)
+        self.experience.flush(self.learned_state())
+    
+    async def close(self) -> None:
+        """Learn from what is pending, then release the memory spill file and experience buffer."""
+        await self.flush_learning()
+        self.memory.close()
+        if self._experience is not None:
+            self._experience.close()
+    
+    def learned_state(self) -> Dict[str, Any]:
+        """JSON-serializable state learned from experiences, persisted with the buffer."""
+        return {}
+    
+    def _schedule_learning(self) -> None:
+        if self._learning is not None and not self._learning.done():
+            return
+        try:
+            self._learning = asyncio.get_running_loop().create_task(self._learn_pending())
+        except RuntimeError:
+            # No running loop (e.g. synchronous callers); learn on the next flush_learning
+            pass
+    
+    async def _learn_pending(self) -> None:
+        batch = self.experience.drain()
+        try:
+            await self.learn_batch(batch)
+            # Persist the cursor together with what was learned from the batch
+            self.experience.flush(self.learned_state())
+        except Exception as e:
+            self.logger.error(f"Batch learning failed: {e}")
+    
     def get_capabilities(self) -> List[str]:
         """Return list of agent capabilities."""
         return getattr(self, 'capabilities', [])
@@ -2,8 +2,10 @@
 Deep agent for decomposing complex tasks into manageable sub-tasks.
 """
 from ..base_agent import BaseAgent
+from ...core.dependency_graph import DependencyGraph
 from typing import Dict, Any, List
 import json
+import numpy as np
 
 class TaskDecomposer(BaseAgent):
     """Decomposes complex tasks using strategic reasoning."""
@@ -11,6 +13,11 @@ class TaskDecomposer(BaseAgent):
     def __init__(self, config: Dict[str, Any]):
         super().__init__("task_decomposer", config)
         self.capabilities = ["task_analysis", "decomposition", "dependency_mapping"]
+        # Learned cost per agent, indexed by the experience buffer's interned label id
+        learned = self.experience.learned
+        self._cost_sum = np.asarray(learned.get('cost_sum', []), dtype=np.float64)
+        self._cost_weight = np.asarray(learned.get('cost_weight', []), dtype=np.float64)
+        self.cost_history_limit = config.get('agents', {}).get('experience', {}).get('cost_history_limit', 1000)
     
     async def initialize(self) -> None:
         """Initialize task decomposition models."""
@@ -25,11 +32,15 @@ class TaskDecomposer(BaseAgent):
         decomposition_plan = await self._analyze_task_complexity(task)
         sub_tasks = await self._generate_sub_tasks(decomposition_plan)
         
+        # Single pass: dependencies, cycle check, waves and critical path
+        graph = self._build_dependency_graph(sub_tasks)
+        
         return {
             "original_task": task,
             "sub_tasks": sub_tasks,
-            "dependencies": await self._identify_dependencies(sub_tasks),
-            "execution_order": await self._determine_execution_order(sub_tasks)
+            "dependencies": graph.dependencies,
+            "execution_order": graph.layers,
+            "dependency_graph": graph.to_dict()
         }
     
     async def _analyze_task_complexity(self, task: Any) -> Dict[str, Any]:
@@ -41,10 +52,52 @@ class TaskDecomposer(BaseAgent):
         """Generate manageable sub-tasks from analysis."""
         # Implement sub-task generation logic
         return [
-            {"id": 1, "description": "Research phase", "agent": "research_agent"},
-            {"id": 2, "description": "Analysis phase", "agent": "analysis_agent"}
+            {"id": 1, "description": "Research phase", "agent": "research_agent",
+             "depends_on": [], "estimated_cost": 1.0},
+            {"id": 2, "description": "Analysis phase", "agent": "analysis_agent",
+             "depends_on": [1], "estimated_cost": 1.0}
         ]
     
+    def _build_dependency_graph(self, sub_tasks: List[Dict[str, Any]]) -> DependencyGraph:
+        """Build the sub-task dependency graph, grouped into concurrent waves."""
+        dependencies = {sub_task["id"]: sub_task.get("depends_on", []) for sub_task in sub_tasks}
+        costs = {sub_task["id"]: self._estimate_cost(sub_task) for sub_task in sub_tasks}
+        return DependencyGraph(dependencies, costs)
+    
+    def _estimate_cost(self, sub_task: Dict[str, Any]) -> float:
+        """Estimate the relative cost of a sub-task."""
+        label = self.experience.strings.lookup(sub_task.get("agent", ""))
+        if label is not None and label < len(self._cost_weight) and self._cost_weight[label] > 0:
+            return float(self._cost_sum[label] / self._cost_weight[label])
+        return float(sub_task.get("estimated_cost", 1.0))
+    
     async def learn(self, experience: Any) -> None:
         """Learn from decomposition experiences."""
-        self.logger.info("Learning from task decomposition experience")
+        # Expects {"agent": ..., "cost": observed cost, "estimated_cost": ...}
+        if not isinstance(experience, dict) or "agent" not in experience or "cost" not in experience:
+            self.logger.warning("Skipping decomposition experience without 'agent' and 'cost'")
+            return
+        self.record_experience(
+            experience["agent"],
+            experience["cost"],
+            [experience.get("estimated_cost", 1.0)]
+        )
+    
+    async def learn_batch(self, batch: np.ndarray) -> None:
+        """Update per-agent cost estimates from a batch of observed costs."""
+        size = len(self.experience.strings)
+        sums = np.bincount(batch['label'], weights=batch['value'], minlength=size)
+        counts = np.bincount(batch['label'], minlength=size).astype(np.float64)
+        
+        if len(self._cost_weight) < size:
+            self._cost_sum = np.pad(self._cost_sum, (0, size - len(self._cost_sum)))
+            self._cost_weight = np.pad(self._cost_weight, (0, size - len(self._cost_weight)))
+        
+        # Cap the weight of older observations so estimates keep tracking recent costs
+        scale = np.minimum(1.0, self.cost_history_limit / np.maximum(self._cost_weight, 1.0))
+        self._cost_sum = self._cost_sum * scale + sums
+        self._cost_weight = self._cost_weight * scale + counts
+        self.logger.info(f"Learned from {len(batch)} decomposition experiences")
+    
+    def learned_state(self) -> Dict[str, Any]:
+        return {'cost_sum': self._cost_sum.tolist(), 'cost_weight': self._cost_weight.tolist()}
@@ -0,0 +1,220 @@
+"""
+Fixed-size experience replay buffer backed by a NumPy structured array.
+"""
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks (Windows); every buffer assumes it is the only writer
+    fcntl = None
+
+class StringTable:
+    """Interns strings to dense int32 ids so records stay fixed-width."""
+    
+    def __init__(self, strings: Sequence[str] = ()):
+        self.strings: List[str] = list(strings)
+        self.ids: Dict[str, int] = {value: index for index, value in enumerate(self.strings)}
+    
+    def intern(self, value: str) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+    
+    def lookup(self, value: str) -> Optional[int]:
+        """Id of a known string, without interning it."""
+        return self.ids.get(value)
+    
+    def __len__(self) -> int:
+        return len(self.strings)
+
+class ExperienceBuffer:
+    """Ring buffer of (timestamp, label, value, features) records with optional memmap persistence."""
+    
+    def __init__(self, name: str, capacity: int = 100000, feature_dim: int = 8,
+                 persist_dir: Optional[str] = None):
+        self.name = name
+        self.capacity = max(1, int(capacity))
+        self.feature_dim = int(feature_dim)
+        self.dtype = np.dtype([
+            ('timestamp', np.float64),
+            ('label', np.int32),
+            ('value', np.float32),
+            ('features', np.float32, (self.feature_dim,)),
+        ])
+        self.strings = StringTable()
+        
+        # Total records ever appended; the write slot is count % capacity
+        self.count = 0
+        self._cursor = 0
+        self._path = None
+        self._meta_path = None
+        self._lock_file = None
+        
+        # Model state learned from drained records, persisted with the ring so neither is lost
+        self.learned: Dict[str, Any] = {}
+        
+        # Single writer: only the process holding the lock persists; others keep an in-memory ring
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+            if self._lock(os.path.join(persist_dir, f"{name}.lock")):
+                self._path = os.path.join(persist_dir, f"{name}.npy")
+                self._meta_path = os.path.join(persist_dir, f"{name}.json")
+        
+        if self._path is not None:
+            self.records = self._open_memmap()
+        else:
+            self.records = np.zeros(self.capacity, dtype=self.dtype)
+    
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any] = None) -> "ExperienceBuffer":
+        """Build a buffer from the `agents.experience` config section."""
+        config = config or {}
+        return cls(
+            name,
+            capacity=config.get('capacity', 100000),
+            feature_dim=config.get('feature_dim', 8),
+            persist_dir=config.get('persist_dir')
+        )
+    
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+    
+    @property
+    def persistent(self) -> bool:
+        """Whether this buffer owns the on-disk ring."""
+        return self._path is not None
+    
+    @property
+    def pending(self) -> int:
+        """Records appended since the last `drain`, capped at what the ring still holds."""
+        return min(self.count - self._cursor, self.capacity)
+    
+    def append(self, label: str, value: float, features: Optional[Sequence[float]] = None,
+               timestamp: Optional[float] = None) -> None:
+        """Record one experience in O(1); the oldest record is overwritten when full."""
+        record = self.records[self.count % self.capacity]
+        known_labels = len(self.strings)
+        record['timestamp'] = timestamp or time.time()
+        record['label'] = self.strings.intern(label)
+        record['value'] = value
+        record['features'] = 0
+        if features is not None:
+            features = np.asarray(features, dtype=np.float32)[:self.feature_dim]
+            record['features'][:len(features)] = features
+        self.count += 1
+        
+        # Save the string table as soon as it grows, so persisted label ids always resolve
+        if len(self.strings) != known_labels:
+            self._write_meta()
+    
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """Copy of the most recent `n` records (default: all held), oldest first."""
+        n = len(self) if n is None else min(n, len(self))
+        return self._take(self.count - n, self.count)
+    
+    def drain(self) -> np.ndarray:
+        """Copy of the records appended since the previous drain, oldest first."""
+        start = max(self._cursor, self.count - self.capacity)
+        batch = self._take(start, self.count)
+        self._cursor = self.count
+        return batch
+    
+    def sample(self, n: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Uniform random sample of held records, for replay."""
+        rng = rng or np.random.default_rng()
+        size = len(self)
+        if size == 0:
+            return self.records[:0].copy()
+        return self.records[rng.integers(0, size, size=n)]
+    
+    def labels(self, ids: np.ndarray) -> List[str]:
+        """Translate interned label ids back to strings."""
+        return [self.strings.strings[index] for index in ids.tolist()]
+    
+    def flush(self, learned: Optional[Dict[str, Any]] = None) -> None:
+        """Persist the ring position, learn cursor, string table and learned state next to the memmap."""
+        if learned is not None:
+            self.learned = learned
+        if self._path is None:
+            return
+        self.records.flush()
+        self._write_meta()
+    
+    def close(self) -> None:
+        self.flush()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+    
+    def _write_meta(self) -> None:
+        if self._meta_path is None:
+            return
+        meta = {
+            'count': self.count,
+            'cursor': self._cursor,
+            'capacity': self.capacity,
+            'feature_dim': self.feature_dim,
+            'strings': self.strings.strings,
+            'learned': self.learned
+        }
+        temporary = f"{self._meta_path}.tmp"
+        with open(temporary, 'w') as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(temporary, self._meta_path)
+    
+    def _take(self, start: int, stop: int) -> np.ndarray:
+        """Copy logical records [start, stop) out of the ring."""
+        if stop <= start:
+            return self.records[:0].copy()
+        first, last = start % self.capacity, stop % self.capacity
+        if first < last:
+            return np.array(self.records[first:last])
+        return np.concatenate([self.records[first:], self.records[:last]])
+    
+    def _open_memmap(self) -> np.ndarray:
+        """Reopen a persisted buffer with the same layout, or create a fresh file."""
+        meta = None
+        if os.path.exists(self._path) and os.path.exists(self._meta_path):
+            try:
+                with open(self._meta_path) as meta_file:
+                    meta = json.load(meta_file)
+            except ValueError:
+                meta = None
+        
+        if meta and meta['capacity'] == self.capacity and meta['feature_dim'] == self.feature_dim:
+            records = np.lib.format.open_memmap(self._path, mode='r+')
+            if records.dtype == self.dtype and records.shape == (self.capacity,):
+                # Records past the saved cursor were never learned from, so they drain again
+                self.count = meta['count']
+                self._cursor = meta.get('cursor', 0)
+                self.strings = StringTable(meta['strings'])
+                self.learned = meta.get('learned', {})
+                return records
+            del records
+        
+        # Without usable metadata the old ring cannot be read back; keep it aside rather than truncate it
+        if os.path.exists(self._path):
+            os.replace(self._path, f"{self._path[:-len('.npy')]}.{int(time.time())}.orphaned.npy")
+        records = np.lib.format.open_memmap(self._path, mode='w+', dtype=self.dtype, shape=(self.capacity,))
+        self._write_meta()
+        return records
+    
+    def _lock(self, path: str) -> bool:
+        """Take the exclusive writer lock for this buffer's files; False if another process holds it."""
+        if fcntl is None:
+            return True
+        lock_file = open(path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
@@ -1,53 +1,96 @@
-
-**src/costbyte/core/agent_orchestrator.py**
-```python
 """
 Core orchestrator for managing AI agents and task workflows.
 """
-from typing import Dict, List, Any
-from ..agents.base_agent import BaseAgent
-from .synthetic_intelligence import SyntheticIntelligence
-from .strategic_intelligence import StrategicIntelligence
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional
+from .agent_registry import AgentRegistry
+from .execution_backend import create_execution_backend
+from .solution_speculation import SolutionSpeculator
+from .step_scheduler import StepResult, StepScheduler
 
 class AgentOrchestrator:
     """Orchestrates complex tasks using multiple AI agents."""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.synthetic_intel = SyntheticIntelligence(config)
-        self.strategic_intel = StrategicIntelligence(config)
-        self.agents: Dict[str, BaseAgent] = {}
-        self._initialize_agents()
-    
-    def _initialize_agents(self):
-        """Initialize all required agents."""
-        # Initialize deep agents
-        from ..agents.deep_agents.task_decomposer import TaskDecomposer
-        from ..agents.deep_agents.reasoning_engine import ReasoningEngine
-        
-        self.agents['decomposer'] = TaskDecomposer(self.config)
-        self.agents['reasoner'] = ReasoningEngine(self.config)
+        # Agents are imported, built and initialized on first use
+        self.agents = AgentRegistry(config)
+        # Agent calls run in-process or on worker processes (agents.execution.backend)
+        self.backend = create_execution_backend(config, self.agents)
+        self.scheduler = StepScheduler.from_config(config)
+        self.speculator = SolutionSpeculator.from_config(config)
+        self._synthetic_intel = None
+        self._strategic_intel = None
+    
+    @property
+    def synthetic_intel(self):
+        """Synthetic intelligence engine, imported on first access."""
+        if self._synthetic_intel is None:
+            from .synthetic_intelligence import SyntheticIntelligence
+            self._synthetic_intel = SyntheticIntelligence(self.config)
+        return self._synthetic_intel
+    
+    @property
+    def strategic_intel(self):
+        """Strategic intelligence engine, imported on first access."""
+        if self._strategic_intel is None:
+            from .strategic_intelligence import StrategicIntelligence
+            self._strategic_intel = StrategicIntelligence(self.config)
+        return self._strategic_intel
     
     async def execute_complex_task(self, task_description: str) -> Any:
         """Execute a complex task using coordinated agents."""
         # Use strategic intelligence to plan
         plan = await self.strategic_intel.create_execution_plan(task_description)
         
-        # Use synthetic intelligence to generate solutions
-        solutions = await self.synthetic_intel.generate_solutions(plan)
-        
-        # Coordinate agents for execution
-        results = await self._coordinate_agents(plan, solutions)
-        
-        return results
+        # Generate solutions in the background; steps that need them wait, the rest start now
+        solutions = self._start_solutions(plan)
+        try:
+            return await self._coordinate_agents(plan, solutions)
+        finally:
+            solutions.cancel()
+    
+    async def close(self) -> None:
+        """Stop the execution backend and close every loaded agent."""
+        await self.backend.close()
+        await self.agents.close()
     
-    async def _coordinate_agents(self, plan: Any, solutions: List[Any]) -> Dict[str, Any]:
+    async def execute_complex_task_stream(self, task_description: str,
+                                          cancel_event: Optional[asyncio.Event] = None
+                                          ) -> AsyncIterator[StepResult]:
+        """Execute a complex task, yielding each step's result as it completes."""
+        # Callers stop early with aclose() on the generator or by setting cancel_event
+        plan = await self.strategic_intel.create_execution_plan(task_description)
+        solutions = self._start_solutions(plan)
+        try:
+            async for step_result in self.scheduler.stream(
+                self._runnable_steps(plan), self._step_runner(solutions), cancel_event
+            ):
+                yield step_result
+        finally:
+            solutions.cancel()
+    
+    def _start_solutions(self, plan: Any) -> "asyncio.Future[List[Any]]":
+        """Start speculative solution generation for a plan."""
+        return asyncio.ensure_future(self.speculator.generate(self.synthetic_intel, plan))
+    
+    async def _coordinate_agents(self, plan: Any, solutions: Awaitable[List[Any]]) -> Dict[str, Any]:
         """Coordinate multiple agents to execute the plan."""
-        results = {}
-        
-        for step in plan.steps:
-            agent = self.agents.get(step.agent_type)
-            if agent:
-                results[step.name] = await agent.execute(step, solutions)
+        # Independent steps run concurrently, bounded by agents.deep_agents.max_concurrent
+        return await self.scheduler.run(self._runnable_steps(plan), self._step_runner(solutions))
+    
+    def _runnable_steps(self, plan: Any) -> List[Any]:
+        """Plan steps that have a registered agent; the rest are skipped, as before."""
+        return [step for step in plan.steps if step.agent_type in self.agents]
+    
+    def _step_runner(self, solutions: Awaitable[List[Any]]):
+        """Build the callable that runs one step on its agent."""
+        async def run_step(step):
+            # Steps marked needs_solutions=False don't wait for generation to finish;
+            # shield it so one step timing out doesn't cancel it for the others
+            step_solutions = []
+            if getattr(step, 'needs_solutions', True):
+                step_solutions = await asyncio.shield(solutions)
+            return await self.backend.execute(step.agent_type, step, step_solutions)
         
-        return results
+        return run_step
@@ -0,0 +1,82 @@
+"""
+Lazy registry that imports, builds and initializes agents on first use.
+"""
+import asyncio
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+from ..utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from ..agents.base_agent import BaseAgent
+
+# Agent type -> "module:ClassName", resolved relative to the costbyte package
+DEFAULT_AGENTS = {
+    'decomposer': '..agents.deep_agents.task_decomposer:TaskDecomposer',
+    'reasoner': '..agents.deep_agents.reasoning_engine:ReasoningEngine',
+}
+
+class AgentRegistry:
+    """Builds each agent type the first time a plan step asks for it."""
+    
+    def __init__(self, config: Dict[str, Any], specs: Dict[str, str] = None):
+        self.config = config
+        self.specs = dict(DEFAULT_AGENTS if specs is None else specs)
+        self.logger = get_logger("agent_registry")
+        self._agents: Dict[str, "BaseAgent"] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    def register(self, agent_type: str, spec: str) -> None:
+        """Register an agent type by its "module:ClassName" import path."""
+        self.specs[agent_type] = spec
+        self._agents.pop(agent_type, None)
+    
+    def __contains__(self, agent_type: str) -> bool:
+        return agent_type in self.specs
+    
+    def registered_types(self) -> List[str]:
+        """Return all agent types that can be built."""
+        return list(self.specs)
+    
+    def loaded(self) -> Dict[str, "BaseAgent"]:
+        """Return the agents that have been built and initialized so far."""
+        return dict(self._agents)
+    
+    async def get(self, agent_type: str) -> "BaseAgent":
+        """Return the initialized agent for a type, building it on first use."""
+        agent = self._agents.get(agent_type)
+        if agent is not None:
+            return agent
+        
+        if agent_type not in self.specs:
+            raise KeyError(f"Unknown agent type: {agent_type}")
+        
+        # Concurrent first callers wait on the same lock so initialize runs once
+        lock = self._locks.setdefault(agent_type, asyncio.Lock())
+        async with lock:
+            agent = self._agents.get(agent_type)
+            if agent is None:
+                agent = self._build(agent_type)
+                await agent.initialize()
+                self._agents[agent_type] = agent
+                self.logger.info(f"Loaded agent '{agent_type}'")
+        
+        return agent
+    
+    async def close(self) -> None:
+        """Close every loaded agent."""
+        agents, self._agents = self._agents, {}
+        for agent_type, agent in agents.items():
+            try:
+                await agent.close()
+            except Exception as e:
+                self.logger.error(f"Failed to close agent '{agent_type}': {e}")
+    
+    def agent_class(self, agent_type: str) -> type:
+        """Import and return the agent class without building it."""
+        module_path, class_name = self.specs[agent_type].split(':')
+        module = importlib.import_module(module_path, package=__package__)
+        return getattr(module, class_name)
+    
+    def _build(self, agent_type: str) -> "BaseAgent":
+        """Import the agent class and construct it."""
+        return self.agent_class(agent_type)(self.config)
@@ -0,0 +1,110 @@
+"""
+Dependency graph with topological layering and critical-path analysis.
+"""
+from collections import deque
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+class DependencyCycleError(ValueError):
+    """Raised when a dependency graph contains a cycle."""
+    
+    def __init__(self, nodes: List[Hashable]):
+        super().__init__(f"Dependency cycle among: {nodes}")
+        self.nodes = nodes
+
+class DependencyGraph:
+    """Directed acyclic graph of work items, grouped into concurrent waves."""
+    
+    def __init__(self, dependencies: Dict[Hashable, Iterable[Hashable]],
+                 costs: Optional[Dict[Hashable, float]] = None):
+        self.nodes = list(dependencies)
+        known = set(self.nodes)
+        costs = costs or {}
+        
+        # Edges to unknown nodes are dropped so callers can pass partial plans;
+        # a node depending on itself is kept and reported as a cycle
+        self.dependencies = {
+            node: [dep for dep in dict.fromkeys(deps) if dep in known]
+            for node, deps in dependencies.items()
+        }
+        self.dependents: Dict[Hashable, List[Hashable]] = {node: [] for node in self.nodes}
+        for node, deps in self.dependencies.items():
+            for dep in deps:
+                self.dependents[dep].append(node)
+        
+        self.costs = {node: float(costs.get(node, 1.0)) for node in self.nodes}
+        self.layers = self._compute_layers()
+        self._compute_critical_path()
+    
+    def _compute_layers(self) -> List[List[Hashable]]:
+        """Group nodes into waves using Kahn's algorithm in O(V + E)."""
+        indegree = {node: len(deps) for node, deps in self.dependencies.items()}
+        current = [node for node in self.nodes if indegree[node] == 0]
+        layers = []
+        visited = 0
+        
+        while current:
+            layers.append(current)
+            visited += len(current)
+            following = []
+            for node in current:
+                for child in self.dependents[node]:
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        following.append(child)
+            current = following
+        
+        if visited < len(self.nodes):
+            raise DependencyCycleError([node for node in self.nodes if indegree[node] > 0])
+        
+        return layers
+    
+    def _compute_critical_path(self) -> None:
+        """Compute earliest finish times and the longest cost-weighted path."""
+        self.earliest_start: Dict[Hashable, float] = {}
+        self.earliest_finish: Dict[Hashable, float] = {}
+        predecessor: Dict[Hashable, Optional[Hashable]] = {}
+        
+        for node in self.topological_order():
+            start, parent = 0.0, None
+            for dep in self.dependencies[node]:
+                if self.earliest_finish[dep] > start:
+                    start, parent = self.earliest_finish[dep], dep
+            self.earliest_start[node] = start
+            self.earliest_finish[node] = start + self.costs[node]
+            predecessor[node] = parent
+        
+        self.critical_path: List[Hashable] = []
+        self.critical_path_length = 0.0
+        if not self.nodes:
+            return
+        
+        node = max(self.nodes, key=self.earliest_finish.__getitem__)
+        self.critical_path_length = self.earliest_finish[node]
+        path = deque()
+        while node is not None:
+            path.appendleft(node)
+            node = predecessor[node]
+        self.critical_path = list(path)
+    
+    def topological_order(self) -> List[Hashable]:
+        """Return nodes in an order where dependencies come first."""
+        return [node for layer in self.layers for node in layer]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the graph for executors and API responses."""
+        return {
+            "nodes": {
+                node: {
+                    "depends_on": self.dependencies[node],
+                    "estimated_cost": self.costs[node],
+                    "earliest_start": self.earliest_start[node],
+                    "level": level
+                }
+                for level, layer in enumerate(self.layers)
+                for node in layer
+            },
+            "layers": self.layers,
+            "critical_path": self.critical_path,
+            "critical_path_length": self.critical_path_length,
+            "total_cost": sum(self.costs.values())
+        }
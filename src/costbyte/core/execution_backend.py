@@ -0,0 +1,269 @@
+"""
+Pluggable backends that run agent steps in-process or on a pool of worker processes.
+"""
+import asyncio
+import itertools
+import multiprocessing
+import pickle
+import queue
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from ..utils.logger import get_logger
+from .agent_registry import AgentRegistry
+
+class WorkerCrashedError(RuntimeError):
+    """Raised when a task's worker died more times than the retry budget allows."""
+
+class ExecutionBackend(ABC):
+    """Runs `BaseAgent.execute` for plan steps."""
+    
+    async def start(self) -> None:
+        """Acquire resources before the first task."""
+        pass
+    
+    @abstractmethod
+    async def execute(self, agent_type: str, step: Any, solutions: Any) -> Any:
+        """Run one step on an agent of `agent_type` and return its result."""
+        pass
+    
+    async def close(self) -> None:
+        """Release resources."""
+        pass
+
+class LocalBackend(ExecutionBackend):
+    """Runs agents in the caller's event loop."""
+    
+    def __init__(self, registry: AgentRegistry):
+        self.registry = registry
+    
+    async def execute(self, agent_type: str, step: Any, solutions: Any) -> Any:
+        agent = await self.registry.get(agent_type)
+        return await agent.execute(step, solutions)
+    
+    async def close(self) -> None:
+        await self.registry.close()
+
+def _worker_main(worker_id: int, config: Dict[str, Any], specs: Dict[str, str],
+                 tasks: Any, results: Any) -> None:
+    """Worker process entry point: run tasks from `tasks` until a None sentinel arrives."""
+    asyncio.run(_worker_loop(worker_id, config, specs, tasks, results))
+
+async def _worker_loop(worker_id: int, config: Dict[str, Any], specs: Dict[str, str],
+                       tasks: Any, results: Any) -> None:
+    logger = get_logger(f"execution_worker_{worker_id}")
+    registry = AgentRegistry(config, specs)
+    loop = asyncio.get_running_loop()
+    running = set()
+    
+    async def run(task_id, agent_type, step, solutions):
+        try:
+            agent = await registry.get(agent_type)
+            result = (task_id, True, await agent.execute(step, solutions))
+        except Exception as e:
+            result = (task_id, False, e)
+        
+        try:
+            # Queues pickle in a background thread, so check here where failures can be reported
+            pickle.dumps(result)
+        except Exception as e:
+            result = (task_id, False, RuntimeError(f"Unpicklable result: {type(e).__name__}: {e}"))
+        results.put(result)
+    
+    while True:
+        message = await loop.run_in_executor(None, tasks.get)
+        if message is None:
+            break
+        task = asyncio.ensure_future(run(*message))
+        running.add(task)
+        task.add_done_callback(running.discard)
+    
+    if running:
+        await asyncio.wait(running)
+    await registry.close()
+    logger.info(f"Worker {worker_id} stopped")
+
+class ProcessPoolBackend(ExecutionBackend):
+    """Sends agent work to worker processes through task queues."""
+    
+    def __init__(self, config: Dict[str, Any], specs: Dict[str, str] = None, workers: int = None,
+                 max_pending: int = 100, max_retries: int = 2,
+                 queue_factory: Optional[Callable[[], Any]] = None,
+                 stateful_agents: Iterable[str] = ()):
+        self.config = config
+        self.specs = specs
+        self._stateful: Dict[str, bool] = {agent_type: True for agent_type in stateful_agents}
+        self.context = multiprocessing.get_context('spawn')
+        self.workers = workers or self.context.cpu_count()
+        self.max_retries = max_retries
+        self.logger = get_logger("process_pool_backend")
+        
+        # Queues only need put/get, so a Redis-backed queue can stand in for these
+        self.queue_factory = queue_factory or self.context.Queue
+        self.results = self.queue_factory()
+        self._task_queues: List[Any] = []
+        self._processes: List[Any] = []
+        
+        # Bounds submitted-but-unfinished tasks so producers wait instead of flooding workers
+        self._slots = asyncio.Semaphore(max_pending)
+        self._ids = itertools.count()
+        self._inflight: Dict[int, Dict[str, Any]] = {}
+        self._load: List[int] = []
+        self._next_worker = 0
+        self._collector: Optional[asyncio.Task] = None
+        self._closing = False
+        self._stopped = False
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], specs: Dict[str, str] = None) -> "ProcessPoolBackend":
+        """Build a backend from the `agents.execution` config section."""
+        execution = config.get('agents', {}).get('execution', {})
+        return cls(
+            config,
+            specs=specs,
+            workers=execution.get('workers'),
+            max_pending=execution.get('max_pending', 100),
+            max_retries=execution.get('max_retries', 2),
+            stateful_agents=execution.get('stateful_agents', ())
+        )
+    
+    async def start(self) -> None:
+        if self._collector is not None:
+            return
+        for worker_id in range(self.workers):
+            self._task_queues.append(self.queue_factory())
+            self._processes.append(self._spawn(worker_id))
+            self._load.append(0)
+        self._collector = asyncio.ensure_future(self._collect())
+    
+    def worker_for(self, agent_type: str, affinity_key: Optional[str] = None) -> int:
+        """Pick a worker: pinned by affinity key for stateful work, otherwise least loaded."""
+        if affinity_key is None and self._is_stateful(agent_type):
+            affinity_key = agent_type
+        if affinity_key is not None:
+            return zlib.crc32(str(affinity_key).encode('utf-8')) % self.workers
+        
+        # Least loaded, starting the scan after the last pick so ties rotate round-robin
+        order = [(self._next_worker + offset) % self.workers for offset in range(self.workers)]
+        worker_id = min(order, key=lambda index: self._load[index])
+        self._next_worker = (worker_id + 1) % self.workers
+        return worker_id
+    
+    async def execute(self, agent_type: str, step: Any, solutions: Any,
+                      affinity_key: Optional[str] = None) -> Any:
+        if self._closing:
+            raise RuntimeError("Execution backend is closed")
+        await self.start()
+        try:
+            # Queues pickle on a feeder thread that only logs failures, so check before sending
+            pickle.dumps((agent_type, step, solutions))
+        except Exception as e:
+            raise TypeError(f"Unpicklable task for '{agent_type}': {type(e).__name__}: {e}") from e
+        
+        async with self._slots:
+            task_id = next(self._ids)
+            worker_id = self.worker_for(agent_type, affinity_key or getattr(step, 'affinity_key', None))
+            self._load[worker_id] += 1
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[task_id] = {
+                'worker': worker_id,
+                'message': (task_id, agent_type, step, solutions),
+                'attempts': 1,
+                'future': future
+            }
+            self._task_queues[worker_id].put(self._inflight[task_id]['message'])
+            try:
+                return await future
+            finally:
+                self._load[worker_id] -= 1
+                self._inflight.pop(task_id, None)
+    
+    async def close(self) -> None:
+        if self._collector is None:
+            return
+        self._closing = True
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for process in self._processes:
+            await asyncio.get_running_loop().run_in_executor(None, process.join, 30)
+            if process.is_alive():
+                process.terminate()
+        
+        # Workers have exited; read the results they sent while draining, then stop
+        self._stopped = True
+        await self._collector
+        self._collector = None
+        
+        for entry in self._inflight.values():
+            if not entry['future'].done():
+                entry['future'].set_exception(RuntimeError("Execution backend closed before the task finished"))
+    
+    def _is_stateful(self, agent_type: str) -> bool:
+        """Whether the agent class (or config) asks for worker affinity; cached per type."""
+        if agent_type not in self._stateful:
+            try:
+                agent_class = AgentRegistry(self.config, self.specs).agent_class(agent_type)
+                self._stateful[agent_type] = bool(getattr(agent_class, 'stateful', False))
+            except Exception as e:
+                self.logger.warning(f"Cannot inspect agent '{agent_type}': {e}")
+                self._stateful[agent_type] = False
+        return self._stateful[agent_type]
+    
+    def _spawn(self, worker_id: int) -> Any:
+        process = self.context.Process(
+            target=_worker_main,
+            args=(worker_id, self.config, self.specs, self._task_queues[worker_id], self.results),
+            daemon=True
+        )
+        process.start()
+        return process
+    
+    async def _collect(self) -> None:
+        """Resolve futures from the result queue and watch for crashed workers."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._closing:
+                self._check_workers()
+            try:
+                task_id, ok, payload = await loop.run_in_executor(None, self.results.get, True, 0.5)
+            except queue.Empty:
+                if self._stopped:
+                    return
+                continue
+            
+            entry = self._inflight.get(task_id)
+            if entry is None or entry['future'].done():
+                continue
+            if ok:
+                entry['future'].set_result(payload)
+            else:
+                entry['future'].set_exception(payload)
+    
+    def _check_workers(self) -> None:
+        """Restart dead workers and requeue the tasks they were holding."""
+        for worker_id, process in enumerate(self._processes):
+            if process.is_alive() or self._closing:
+                continue
+            
+            self.logger.warning(f"Worker {worker_id} exited with code {process.exitcode}; restarting")
+            # The dead process may have corrupted its queue, so the replacement gets a fresh one
+            self._task_queues[worker_id] = self.queue_factory()
+            self._processes[worker_id] = self._spawn(worker_id)
+            
+            for entry in self._inflight.values():
+                if entry['worker'] != worker_id or entry['future'].done():
+                    continue
+                if entry['attempts'] > self.max_retries:
+                    entry['future'].set_exception(WorkerCrashedError(
+                        f"Task {entry['message'][0]} lost {entry['attempts']} worker(s)"
+                    ))
+                    continue
+                entry['attempts'] += 1
+                self._task_queues[worker_id].put(entry['message'])
+
+def create_execution_backend(config: Dict[str, Any], registry: AgentRegistry) -> ExecutionBackend:
+    """Pick the backend named by `agents.execution.backend` (default: local)."""
+    execution = config.get('agents', {}).get('execution', {})
+    if execution.get('backend', 'local') == 'process':
+        return ProcessPoolBackend.from_config(config, specs=registry.specs)
+    return LocalBackend(registry)
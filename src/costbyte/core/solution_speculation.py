@@ -0,0 +1,117 @@
+"""
+Speculative, concurrent solution generation with early cutoff.
+"""
+import asyncio
+import inspect
+import json
+from typing import Any, Dict, List
+from ..utils.logger import get_logger
+
+def default_score(solution: Any) -> float:
+    """Read a `score` or `confidence` from a solution; unscored solutions count as good."""
+    for field in ('score', 'confidence'):
+        value = solution.get(field) if isinstance(solution, dict) else getattr(solution, field, None)
+        if isinstance(value, (int, float)):
+            return float(value)
+    return 1.0
+
+def estimate_tokens(solution: Any) -> int:
+    """Rough token count (about four characters per token)."""
+    return max(1, len(str(solution)) // 4)
+
+def candidate_key(solution: Any) -> str:
+    """Content key used to drop duplicate candidates across attempts."""
+    try:
+        return json.dumps(solution, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return repr(solution)
+
+def as_candidates(result: Any) -> List[Any]:
+    """Lists and tuples hold several candidates; any other result (e.g. a dict) is one candidate."""
+    if result is None:
+        return []
+    if isinstance(result, (list, tuple)):
+        return list(result)
+    return [result]
+
+class SolutionSpeculator:
+    """Runs several `generate_solutions` calls at once and stops when enough good candidates exist."""
+    
+    def __init__(self, fan_out: int = 3, min_good: int = 3, score_threshold: float = 0.7,
+                 max_tokens: int = 4000):
+        self.fan_out = max(1, int(fan_out))
+        self.min_good = max(1, int(min_good))
+        self.score_threshold = score_threshold
+        self.max_tokens = max_tokens
+        self.logger = get_logger("solution_speculator")
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "SolutionSpeculator":
+        """Build a speculator from the `synthetic_intelligence` config section."""
+        synthetic = config.get('synthetic_intelligence', {})
+        return cls(
+            fan_out=synthetic.get('fan_out', 3),
+            min_good=synthetic.get('min_good_solutions', 3),
+            score_threshold=synthetic.get('score_threshold', 0.7),
+            max_tokens=synthetic.get('max_tokens', 4000)
+        )
+    
+    async def generate(self, intel: Any, plan: Any) -> List[Any]:
+        """Return candidate solutions for `plan`, best first; a single attempt's result is returned as is."""
+        attempts = self.attempts(intel)
+        if attempts == 1:
+            # Identical calls would only repeat (and pay for) the same answer
+            return await intel.generate_solutions(plan)
+        
+        scorer = getattr(intel, 'score_solution', None) or default_score
+        tasks = [
+            asyncio.ensure_future(intel.generate_solutions(plan, attempt=attempt))
+            for attempt in range(attempts)
+        ]
+        scored = []
+        seen = set()
+        tokens = 0
+        errors = []
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    candidates = await next_done
+                except Exception as e:
+                    self.logger.warning(f"Solution generation attempt failed: {e}")
+                    errors.append(e)
+                    continue
+                
+                for candidate in as_candidates(candidates):
+                    key = candidate_key(candidate)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    
+                    score = scorer(candidate)
+                    if inspect.isawaitable(score):
+                        score = await score
+                    scored.append((score, candidate))
+                    tokens += estimate_tokens(candidate)
+                
+                # Cut off once enough good candidates exist or the token budget is spent
+                good = sum(1 for score, _ in scored if score >= self.score_threshold)
+                if good >= self.min_good or tokens >= self.max_tokens:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        if not scored and errors:
+            raise errors[0]
+        
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [candidate for _, candidate in scored]
+    
+    def attempts(self, intel: Any) -> int:
+        """Fan out only when `generate_solutions` takes an `attempt` index to vary each call."""
+        try:
+            parameters = inspect.signature(intel.generate_solutions).parameters
+        except (TypeError, ValueError):
+            return 1
+        return self.fan_out if 'attempt' in parameters else 1
@@ -0,0 +1,130 @@
+"""
+Dependency-aware scheduler for running plan steps concurrently.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from ..utils.logger import get_logger
+from .dependency_graph import DependencyGraph
+
+class StepResult:
+    """Outcome of one plan step, with wall-clock timing."""
+    
+    def __init__(self, name: str, result: Any, started_at: float, finished_at: float):
+        self.name = name
+        self.result = result
+        self.started_at = started_at
+        self.finished_at = finished_at
+    
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'step': self.name,
+            'result': self.result,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'duration': self.duration
+        }
+
+class StepScheduler:
+    """Runs plan steps as a DAG, starting each step once its dependencies finish."""
+    
+    def __init__(self, max_concurrent: int = 5, default_timeout: float = 300):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.default_timeout = default_timeout
+        self.logger = get_logger("step_scheduler")
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "StepScheduler":
+        """Build a scheduler from the `agents.deep_agents` config section."""
+        deep_agents = config.get('agents', {}).get('deep_agents', {})
+        return cls(
+            max_concurrent=deep_agents.get('max_concurrent', 5),
+            default_timeout=deep_agents.get('timeout', 300)
+        )
+    
+    async def run(self, steps: List[Any],
+                  execute_step: Callable[[Any], Awaitable[Any]]) -> Dict[str, Any]:
+        """Execute all steps, returning results keyed by step name."""
+        results = {}
+        async for step_result in self.stream(steps, execute_step):
+            results[step_result.name] = step_result.result
+        
+        # Keep results in plan order regardless of completion order
+        return {step.name: results[step.name] for step in steps}
+    
+    async def stream(self, steps: List[Any], execute_step: Callable[[Any], Awaitable[Any]],
+                     cancel_event: Optional[asyncio.Event] = None) -> AsyncIterator[StepResult]:
+        """Yield each step's result as soon as it completes."""
+        # Closing the generator or setting cancel_event cancels the steps still running
+        by_name = {step.name: step for step in steps}
+        waiting, dependents = self._build_graph(by_name)
+        
+        ready = deque(name for name in by_name if not waiting[name])
+        running: Dict[asyncio.Task, str] = {}
+        cancelled = asyncio.ensure_future(cancel_event.wait()) if cancel_event else None
+        
+        try:
+            while ready or running:
+                # Fill free slots with steps whose dependencies are satisfied
+                while ready and len(running) < self.max_concurrent:
+                    name = ready.popleft()
+                    task = asyncio.ensure_future(self._run_step(by_name[name], execute_step))
+                    running[task] = name
+                
+                watched = set(running) | ({cancelled} if cancelled else set())
+                done, _ = await asyncio.wait(watched, return_when=asyncio.FIRST_COMPLETED)
+                if cancelled in done:
+                    self.logger.info(f"Plan cancelled with {len(running)} step(s) running")
+                    return
+                
+                for task in done:
+                    name = running.pop(task)
+                    step_result = task.result()
+                    
+                    for child in dependents[name]:
+                        waiting[child].discard(name)
+                        if not waiting[child]:
+                            ready.append(child)
+                    
+                    yield step_result
+        finally:
+            for task in running:
+                task.cancel()
+            if cancelled:
+                cancelled.cancel()
+    
+    async def _run_step(self, step: Any,
+                        execute_step: Callable[[Any], Awaitable[Any]]) -> StepResult:
+        """Run a single step under its timeout."""
+        timeout = getattr(step, 'timeout', None) or self.default_timeout
+        started_at = time.time()
+        try:
+            result = await asyncio.wait_for(execute_step(step), timeout=timeout)
+            return StepResult(step.name, result, started_at, time.time())
+        except asyncio.TimeoutError:
+            self.logger.error(f"Step '{step.name}' timed out after {timeout}s")
+            raise
+    
+    def _build_graph(self, by_name: Dict[str, Any]):
+        """Map each step to its pending dependencies and its dependents."""
+        waiting = {}
+        dependents = {name: [] for name in by_name}
+        
+        for name, step in by_name.items():
+            deps = set(getattr(step, 'dependencies', None) or [])
+            unknown = deps - by_name.keys()
+            if unknown:
+                # Dependencies on steps that are not scheduled count as satisfied
+                self.logger.debug(f"Step '{name}' ignores unscheduled dependencies: {sorted(unknown)}")
+            waiting[name] = deps & by_name.keys()
+            for dep in waiting[name]:
+                dependents[dep].append(name)
+        
+        # Reject cycles up front rather than deadlocking mid-plan
+        DependencyGraph(waiting)
+        return waiting, dependents
@@ -0,0 +1,17 @@
+import importlib.util
+import logging
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# costbyte.utils.logger is not part of this tree; stand in with stdlib logging so core modules import
+if importlib.util.find_spec('costbyte.utils') is None:
+    utils = types.ModuleType('costbyte.utils')
+    utils.__path__ = []
+    logger = types.ModuleType('costbyte.utils.logger')
+    logger.get_logger = logging.getLogger
+    utils.logger = logger
+    sys.modules['costbyte.utils'] = utils
+    sys.modules['costbyte.utils.logger'] = logger
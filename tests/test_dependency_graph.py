@@ -0,0 +1,32 @@
+import pytest
+
+from costbyte.core.dependency_graph import DependencyCycleError, DependencyGraph
+
+def test_layers_group_independent_nodes():
+    graph = DependencyGraph({'a': [], 'b': [], 'c': ['a', 'b'], 'd': ['c']})
+    assert graph.layers == [['a', 'b'], ['c'], ['d']]
+    assert graph.topological_order() == ['a', 'b', 'c', 'd']
+
+def test_unknown_dependencies_are_ignored():
+    graph = DependencyGraph({'a': ['missing'], 'b': ['a']})
+    assert graph.dependencies == {'a': [], 'b': ['a']}
+    assert graph.layers == [['a'], ['b']]
+
+def test_cycle_is_rejected():
+    with pytest.raises(DependencyCycleError) as error:
+        DependencyGraph({'a': ['c'], 'b': ['a'], 'c': ['b'], 'd': []})
+    assert sorted(error.value.nodes) == ['a', 'b', 'c']
+
+def test_self_dependency_is_a_cycle():
+    with pytest.raises(DependencyCycleError) as error:
+        DependencyGraph({'a': [], 'b': ['b']})
+    assert error.value.nodes == ['b']
+
+def test_critical_path_follows_costs():
+    graph = DependencyGraph(
+        {'a': [], 'b': [], 'c': ['a'], 'd': ['b', 'c']},
+        costs={'a': 1.0, 'b': 5.0, 'c': 1.0, 'd': 2.0}
+    )
+    assert graph.critical_path == ['b', 'd']
+    assert graph.critical_path_length == 7.0
+    assert graph.earliest_start['d'] == 5.0
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from costbyte.core.dependency_graph import DependencyCycleError
+from costbyte.core.step_scheduler import StepScheduler
+
+def step(name, dependencies=(), duration=0.01):
+    return SimpleNamespace(name=name, dependencies=list(dependencies), duration=duration)
+
+async def execute(step):
+    await asyncio.sleep(step.duration)
+    return step.name.upper()
+
+def test_run_returns_results_in_plan_order():
+    steps = [step('a', duration=0.05), step('b'), step('c', ['a', 'b'])]
+    results = asyncio.run(StepScheduler().run(steps, execute))
+    assert list(results.items()) == [('a', 'A'), ('b', 'B'), ('c', 'C')]
+
+def test_dependencies_finish_before_dependents_start():
+    finished = []
+    
+    async def record(step):
+        for dependency in step.dependencies:
+            assert dependency in finished
+        await asyncio.sleep(0.01)
+        finished.append(step.name)
+    
+    steps = [step('a'), step('b', ['a']), step('c', ['b']), step('d', ['a'])]
+    asyncio.run(StepScheduler().run(steps, record))
+    assert sorted(finished) == ['a', 'b', 'c', 'd']
+
+def test_independent_steps_run_concurrently_up_to_the_limit():
+    steps = [step(str(index), duration=0.1) for index in range(4)]
+    started = time.perf_counter()
+    asyncio.run(StepScheduler(max_concurrent=2).run(steps, execute))
+    elapsed = time.perf_counter() - started
+    assert 0.18 < elapsed < 0.35
+
+def test_cycle_is_rejected():
+    steps = [step('a', ['b']), step('b', ['a'])]
+    with pytest.raises(DependencyCycleError):
+        asyncio.run(StepScheduler().run(steps, execute))
+
+def test_self_dependency_is_rejected():
+    steps = [step('a'), step('b', ['b'])]
+    with pytest.raises(DependencyCycleError):
+        asyncio.run(StepScheduler().run(steps, execute))
+
+def test_step_timeout_is_raised():
+    steps = [step('slow', duration=1.0)]
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(StepScheduler(default_timeout=0.05).run(steps, execute))
+
+def test_stream_yields_results_as_they_complete():
+    steps = [step('slow', duration=0.1), step('fast', duration=0.01)]
+    
+    async def collect():
+        return [result.name async for result in StepScheduler().stream(steps, execute)]
+    
+    assert asyncio.run(collect()) == ['fast', 'slow']
+
+def test_stream_stops_when_cancel_event_is_set():
+    steps = [step('a', duration=0.01), step('b', ['a'], duration=1.0)]
+    
+    async def collect():
+        cancel = asyncio.Event()
+        names = []
+        async for result in StepScheduler().stream(steps, execute, cancel):
+            names.append(result.name)
+            cancel.set()
+        return names
+    
+    started = time.perf_counter()
+    assert asyncio.run(collect()) == ['a']
+    assert time.perf_counter() - started < 0.5